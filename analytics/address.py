@@ -0,0 +1,46 @@
+# analytics/address.py
+# Каноническая форма адреса кошелька — ключ колонки transactions.wallet и
+# wallet_stats: BASE — hex в нижнем регистре, TON — raw "wc:hex" в нижнем
+# регистре (из EQ…/UQ…/kQ… и любых вариантов bounceable / non-bounceable).
+import base64
+import binascii
+import re
+from functools import lru_cache
+from typing import Optional
+
+_RAW_TON = re.compile(r"^-?\d+:[0-9a-fA-F]{64}$")
+
+
+def _crc16(data: bytes) -> int:
+    # CRC16-XMODEM из спецификации user-friendly адресов TON
+    crc = 0
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+            crc &= 0xFFFF
+    return crc
+
+
+def _ton_friendly_to_raw(addr: str) -> Optional[str]:
+    try:
+        data = base64.urlsafe_b64decode(addr.replace("+", "-").replace("/", "_"))
+    except (binascii.Error, ValueError):
+        return None
+    if len(data) != 36 or _crc16(data[:34]) != int.from_bytes(data[34:], "big"):
+        return None
+    workchain = int.from_bytes(data[1:2], "big", signed=True)
+    return f"{workchain}:{data[2:34].hex()}"
+
+
+@lru_cache(maxsize=65536)
+def canonical_address(addr: Optional[str]) -> Optional[str]:
+    """Адрес в форме для точного сравнения; нераспознанное — strip + lower."""
+    if addr is None:
+        return None
+    addr = addr.strip()
+    if len(addr) == 48 and not _RAW_TON.match(addr):
+        raw = _ton_friendly_to_raw(addr)
+        if raw is not None:
+            return raw
+    return addr.lower()
@@ -0,0 +1,294 @@
+# analytics/cache.py
+import copy
+import functools
+import hashlib
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from config import (
+    CACHE_MAX_AGE,
+    CACHE_MAX_BYTES,
+    CACHE_MAX_ENTRIES,
+    CACHE_STALE_WHILE_REVALIDATE,
+    CACHE_REFRESH_WORKERS,
+)
+
+from .db import get_connection
+
+
+def _freeze(value) -> Hashable:
+    # списки spec'ов и т.п. → кортежи, чтобы попасть в ключ
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return tuple(sorted(value))
+    return value
+
+
+def _sizeof(value) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _copy(value):
+    # вызывающие (fill_missing_dates и т.п.) мутируют результат — отдаём копию
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+class ResultCache:
+    """LRU результатов аналитики, общий для всех страниц и сессий процесса.
+
+    Запись валидна, пока версия данных в БД не изменилась и ей не больше
+    max_age секунд (окна day/week/month сдвигаются и без новых данных).
+
+    stale_while_revalidate: устаревшая запись отдаётся сразу, а пересчёт
+    уходит в фоновый пул; одновременные запросы одного ключа делят один
+    пересчёт (single-flight). Ждать приходится только на холодном ключе.
+
+    max_bytes=None — только лимит по числу записей: для значений, размер
+    которых _sizeof не видит (фигуры Plotly — сотни байт по getsizeof).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: Optional[int] = CACHE_MAX_BYTES,
+        max_age: float = CACHE_MAX_AGE,
+        stale_while_revalidate: bool = CACHE_STALE_WHILE_REVALIDATE,
+        refresh_workers: int = CACHE_REFRESH_WORKERS,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: dict = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._refresh_workers = refresh_workers
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+
+    def lookup(self, key: Hashable, version: int, count: bool = True) -> Tuple[Any, bool]:
+        """(значение или None, свежее ли оно); count=False — без учёта в статистике."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += count
+                return None, False
+            if not count:
+                return entry[2], entry[0] == version and time.time() - entry[1] <= self.max_age
+            self._entries.move_to_end(key)
+            if entry[0] == version and time.time() - entry[1] <= self.max_age:
+                self.hits += 1
+                return entry[2], True
+            if self.stale_while_revalidate:
+                self.stale_hits += 1
+            else:
+                self.misses += 1
+            return entry[2], False
+
+    def get(self, key: Hashable, version: int) -> Any:
+        value, fresh = self.lookup(key, version)
+        return value if fresh else None
+
+    def single_flight(self, key: Hashable, compute: Callable[[], Any], background: bool = False):
+        """Один пересчёт на ключ; background=True — не ждать результата."""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                if self._executor is None and background:
+                    self._executor = ThreadPoolExecutor(
+                        self._refresh_workers, thread_name_prefix="cache-refresh"
+                    )
+        if owner:
+            if background:
+                self._executor.submit(self._compute, key, future, compute, True)
+            else:
+                self._compute(key, future, compute, False)
+        if background:
+            return None
+        return future.result()
+
+    def _compute(self, key: Hashable, future: Future, compute: Callable[[], Any], background: bool):
+        try:
+            future.set_result(compute())
+            if background:
+                with self._lock:
+                    self.refreshes += 1
+        except BaseException as e:
+            future.set_exception(e)
+            if background:
+                # устаревшая запись остаётся — следующий запрос попробует снова
+                print(f"[cache] background refresh of {key[0]} failed: {e}")
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def put(self, key: Hashable, version: int, value: Any):
+        size = _sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[3]
+            self._entries[key] = (version, time.time(), value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, _, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.stale_hits + self.misses
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / total, 4) if total else 0.0,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes if self.max_bytes is not None else None,
+            }
+
+
+class DiskCache:
+    """Общий для процессов (дашборд, API, экспорт) кэш результатов в SQLite.
+
+    Ключ — хэш repr((namespace, ключ)) и версия данных; значения — pickle.
+    namespace — идентичность базы данных: у разных баз одни и те же версии
+    (0, 1, …), без него они делили бы записи. Ошибки диска не ломают
+    аналитику: запрос просто выполняется заново.
+    """
+
+    def __init__(self, path: str, namespace: str = "", max_age: float = CACHE_MAX_AGE):
+        self.path = path
+        self.namespace = namespace
+        self.max_age = max_age
+        self._ready = False
+        self._pruned_version = -1
+
+    def _con(self) -> sqlite3.Connection:
+        con = get_connection(self.path)
+        if not self._ready:
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    value BLOB NOT NULL
+                )
+                """
+            )
+            con.commit()
+            self._ready = True
+        return con
+
+    def _digest(self, key: Hashable) -> str:
+        return hashlib.sha1(repr((self.namespace, key)).encode()).hexdigest()
+
+    def get(self, key: Hashable, version: int) -> Any:
+        try:
+            row = self._con().execute(
+                "SELECT value FROM results WHERE key = ? AND version = ? AND stored_at >= ?",
+                (self._digest(key), version, time.time() - self.max_age),
+            ).fetchone()
+            return pickle.loads(row[0]) if row else None
+        except (sqlite3.Error, pickle.UnpicklingError) as e:
+            print(f"[cache] disk read failed: {e}")
+            return None
+
+    def put(self, key: Hashable, version: int, value: Any):
+        try:
+            con = self._con()
+            with con:
+                con.execute(
+                    "INSERT OR REPLACE INTO results (key, version, stored_at, value) VALUES (?, ?, ?, ?)",
+                    (self._digest(key), version, time.time(),
+                     pickle.dumps(value, pickle.HIGHEST_PROTOCOL)),
+                )
+                if version > self._pruned_version:
+                    # записи прошлых версий больше никогда не совпадут
+                    con.execute("DELETE FROM results WHERE version < ?", (version,))
+                    self._pruned_version = version
+        except sqlite3.Error as e:
+            print(f"[cache] disk write failed: {e}")
+
+
+def cached(cache: ResultCache, version: Callable[[], int], disk: Optional[DiskCache] = None):
+    """Декоратор: ключ — (функция, аргументы), запись привязана к version().
+
+    С disk промах в памяти сначала ищется в DiskCache, затем считается заново.
+    """
+
+    def decorator(fn):
+        def compute(key, current, args, kwargs):
+            # версия снята до запроса: запись, обогнанная вставкой, сразу устаревшая
+            result = disk.get(key, current) if disk is not None else None
+            if result is None:
+                result = fn(*args, **kwargs)
+                if disk is not None:
+                    disk.put(key, current, result)
+            cache.put(key, current, result)
+            return result
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (fn.__qualname__, _freeze(args), _freeze(kwargs))
+            current = version()
+            value, fresh = cache.lookup(key, current)
+            if fresh:
+                return _copy(value)
+
+            job = functools.partial(compute, key, current, args, kwargs)
+            if value is not None and cache.stale_while_revalidate:
+                cache.single_flight(key, job, background=True)
+                return _copy(value)
+            return _copy(cache.single_flight(key, job))
+
+        def prefetch(*args, **kwargs):
+            """Прогрев записи в фоновом пуле; ничего не ждёт и не возвращает."""
+            key = (fn.__qualname__, _freeze(args), _freeze(kwargs))
+            current = version()
+            if not cache.lookup(key, current, count=False)[1]:
+                cache.single_flight(key, functools.partial(compute, key, current, args, kwargs), background=True)
+
+        wrapper.uncached = fn
+        wrapper.prefetch = prefetch
+        return wrapper
+
+    return decorator
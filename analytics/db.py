@@ -0,0 +1,124 @@
+# analytics/db.py
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Optional
+from config import DB_PATH, SNAPSHOT_PATH, READ_FROM_SNAPSHOT
+
+# применяются один раз при открытии соединения, а не на каждый запрос
+PRAGMAS = {
+    # до journal_mode: действует только для нового файла, старый переводит maintenance
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,           # мс
+    "cache_size": -64000,           # ~64 MiB
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+# читателям режим журнала не нужен (и в mode=ro его не поменять)
+READ_PRAGMAS = {
+    "query_only": 1,
+    "busy_timeout": 5000,
+    "cache_size": -64000,
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+_local = threading.local()
+
+
+def _file_id(path: str) -> Optional[tuple]:
+    """(inode, mtime) файла: os.replace снапшота меняет его в любом процессе."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def connect(path: str = DB_PATH, readonly: bool = False) -> sqlite3.Connection:
+    """Новое соединение с настроенными PRAGMA (для долгоживущих владельцев)."""
+    if readonly:
+        uri = f"file:{os.path.abspath(path)}?mode=ro"
+        if path == SNAPSHOT_PATH:
+            uri += "&immutable=1"  # снапшот не меняется на месте, только подменяется
+        con = sqlite3.connect(uri, uri=True)
+        pragmas = READ_PRAGMAS
+    else:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        con = sqlite3.connect(path)
+        pragmas = PRAGMAS
+    for name, value in pragmas.items():
+        con.execute(f"PRAGMA {name}={value}")
+    return con
+
+
+def get_connection(path: str = DB_PATH, readonly: bool = False) -> sqlite3.Connection:
+    """Переиспользуемое соединение текущего потока."""
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = {}
+    key = (path, readonly)
+    con, file_id = pool.get(key, (None, None))
+    # снапшот подменяет любой процесс (планировщик), а immutable=1 не заметит
+    # новый файл сам — соединение открыто к прежнему inode и переоткрывается
+    current = _file_id(path) if path == SNAPSHOT_PATH else None
+    if con is not None and current != file_id:
+        con.close()
+        con = None
+    if con is None:
+        con = connect(path, readonly=readonly)
+        pool[key] = (con, current)
+    return con
+
+
+def close_connection(path: str = DB_PATH, readonly: bool = False):
+    pool = getattr(_local, "pool", {})
+    con, _ = pool.pop((path, readonly), (None, None))
+    if con is not None:
+        con.close()
+
+
+def _read_path() -> str:
+    if READ_FROM_SNAPSHOT and os.path.exists(SNAPSHOT_PATH):
+        return SNAPSHOT_PATH
+    return DB_PATH
+
+
+@contextmanager
+def read_conn(path: Optional[str] = None):
+    # только чтение: mode=ro + query_only, без commit, соединение остаётся в пуле потока
+    yield get_connection(path or _read_path(), readonly=True)
+
+
+@contextmanager
+def write_conn(path: str = DB_PATH):
+    con = get_connection(path)
+    with con:  # commit при успехе, rollback при исключении
+        yield con
+
+
+# ---------- WAL / snapshot ----------
+def checkpoint(con: sqlite3.Connection, mode: str = "PASSIVE") -> tuple:
+    """(busy, wal_pages, checkpointed_pages); вызывать вне транзакции."""
+    return con.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+
+
+def refresh_snapshot(path: str = DB_PATH, snapshot_path: str = SNAPSHOT_PATH):
+    """Копия БД через backup API; читатели переключаются атомарно через os.replace.
+
+    Другие процессы замечают замену по inode/mtime файла (get_connection).
+    """
+    tmp_path = snapshot_path + ".tmp"
+    src = connect(path, readonly=True)
+    dst = sqlite3.connect(tmp_path)
+    try:
+        src.backup(dst)
+        dst.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        dst.close()
+        src.close()
+    os.replace(tmp_path, snapshot_path)
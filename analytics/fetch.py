@@ -1,8 +1,9 @@
 import sys
 import time
-import httpx
-import requests
-from typing import List, Dict, Union, Optional
+from typing import List, Dict, Union, Optional, Tuple
+
+ETHERSCAN_URL = "https://api.etherscan.io/v2/api"
+TONCENTER_URL = "https://toncenter.com/api/v2/getTransactions"
 
 
 def fetch_base_transactions(
@@ -14,8 +15,11 @@ def fetch_base_transactions(
     offset: int = 1000,
     timeout: int = 20,
     sort: str = "asc",
+    run=None,
 ) -> List[Dict]:
-    base_url = "https://api.etherscan.io/v2/api"
+    """run — analytics.ingest_stats.IngestRun: счётчики запросов и ответов 429."""
+    import requests  # HTTP-клиенты нужны только планировщику — не на старте страниц
+
     page = 1
     all_txs = []
 
@@ -33,7 +37,10 @@ def fetch_base_transactions(
             "apikey": apikey,
         }
 
-        response = requests.get(base_url, params=params, timeout=timeout)
+        response = requests.get(ETHERSCAN_URL, params=params, timeout=timeout)
+        if run is not None:
+            run.requests += 1
+            run.http_429 += response.status_code == 429
         response.raise_for_status()
 
         payload = response.json()
@@ -49,10 +56,62 @@ def fetch_base_transactions(
     return all_txs
 
 
+def fetch_base_last_tx(
+    chainid: int, address: str, apikey: str = None, timeout: int = 20, run=None
+) -> Optional[Tuple[int, int]]:
+    """(блок, время) самой новой транзакции контракта у источника — отдельным
+    запросом, независимо от загружаемого батча; None при ошибке."""
+    import requests
+
+    try:
+        response = requests.get(
+            ETHERSCAN_URL,
+            params={
+                "chainid": chainid,
+                "module": "account",
+                "action": "txlist",
+                "address": address,
+                "page": 1,
+                "offset": 1,
+                "sort": "desc",
+                "apikey": apikey,
+            },
+            timeout=timeout,
+        )
+        if run is not None:
+            run.requests += 1
+            run.http_429 += response.status_code == 429
+        response.raise_for_status()
+        tx = response.json()["result"][0]
+        return int(tx["blockNumber"]), int(tx["timeStamp"])
+    except Exception as e:
+        print(f"Last tx error: {e}", file=sys.stderr)
+        return None
+
+
+def fetch_ton_last_tx(address: str, timeout: int = 15, run=None) -> Optional[Tuple[int, int]]:
+    """(lt, utime) последней транзакции аккаунта у toncenter; None при ошибке."""
+    import httpx
+
+    try:
+        if run is not None:
+            run.requests += 1
+        resp = httpx.get(TONCENTER_URL, params={"address": address, "limit": 1}, timeout=timeout)
+        if run is not None:
+            run.http_429 += resp.status_code == 429
+        resp.raise_for_status()
+        tx = resp.json()["result"][0]
+        return int(tx["transaction_id"]["lt"]), int(tx["utime"])
+    except Exception as e:
+        print(f"Last tx error: {e}", file=sys.stderr)
+        return None
+
+
 def fetch_ton_transactions(
-    address: str, limit: int = 100, max_pages: int = 10_000
+    address: str, limit: int = 100, max_pages: int = 10_000, run=None
 ) -> List[Dict]:
-    BASE_URL = "https://toncenter.com/api/v2/getTransactions"
+    import httpx
+
     all_txs: List[Dict] = []
     from_lt: Optional[str] = None
     from_hash: Optional[str] = None
@@ -72,9 +131,13 @@ def fetch_ton_transactions(
                     params["hash"] = from_hash
 
                 try:
-                    resp = client.get(BASE_URL, params=params)
+                    if run is not None:
+                        run.requests += 1
+                    resp = client.get(TONCENTER_URL, params=params)
 
                     if resp.status_code == 429:
+                        if run is not None:
+                            run.http_429 += 1
                         time.sleep(5)
                         continue
 
@@ -0,0 +1,118 @@
+# analytics/ingest_stats.py
+# Замеры загрузки по контрактам: длительность стадий, запросы и 429, строки,
+# отставание сохранённых данных от источника. Пишутся в ingest_runs (storage), читаются
+# страницей Ingestion Health.
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import pandas as pd
+
+from config import INGEST_BEHIND_SECONDS, INGEST_STALE_MINUTES
+
+from .storage import query_ingest_runs, record_ingest_run
+
+STAGES = ("fetch", "decode", "transform", "upsert")
+
+
+class IngestRun:
+    """Один проход загрузки по контракту.
+
+    fetch — HTTP (вместе с паузами между страницами), decode — разбор ABI / BOC
+    внутри transform, transform — остальное преобразование (без decode),
+    upsert — запись до commit'а. Счётчики requests / http_429 ведут fetch-функции.
+    head_block / head_ts — новейшая транзакция контракта у источника, снятая
+    отдельным запросом до загрузки (для TON блок — lt).
+    """
+
+    def __init__(self, network: str, name: str, contract: str):
+        self.network = network
+        self.name = name
+        self.contract = contract
+        self.started_at = time.time()
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.requests = 0
+        self.http_429 = 0
+        self.rows_fetched = 0
+        self.rows_inserted = 0
+        self.rows_ignored = 0
+        self.head_block: Optional[int] = None
+        self.head_ts: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+
+    def add(self, name: str, seconds: float):
+        self.seconds[name] += seconds
+
+    def as_row(self) -> dict:
+        ms = {f"{name}_ms": round(sec * 1000, 2) for name, sec in self.seconds.items()}
+        # decode измеряется внутри transform — здесь вычитается
+        ms["transform_ms"] = round(max(ms["transform_ms"] - ms["decode_ms"], 0.0), 2)
+        return {
+            "started_at": self.started_at,
+            "network": self.network,
+            "name": self.name,
+            "contract": self.contract,
+            **ms,
+            "total_ms": round((time.time() - self.started_at) * 1000, 2),
+            "requests": self.requests,
+            "http_429": self.http_429,
+            "rows_fetched": self.rows_fetched,
+            "rows_inserted": self.rows_inserted,
+            "rows_ignored": self.rows_ignored,
+            "head_block": self.head_block,
+            "head_ts": self.head_ts,
+            "error": self.error,
+        }
+
+    def summary(self) -> str:
+        stages = " ".join(f"{name}={sec * 1000:.0f}ms" for name, sec in self.seconds.items())
+        return f"{stages} req={self.requests} 429={self.http_429}"
+
+    def save(self):
+        """Запись в ingest_runs; ошибка записи не должна ронять цикл загрузки."""
+        try:
+            record_ingest_run(self.as_row())
+        except Exception as e:
+            print(f"[INGEST] Failed to record run for {self.name}: {e}")
+
+
+def ingest_health(hours: float = 24, now: Optional[float] = None) -> dict:
+    """{"latest": последний проход по каждому контракту со статусом, "runs": все за hours}."""
+    now = time.time() if now is None else now
+    runs = query_ingest_runs(since=now - hours * 3600)
+    if runs.empty:
+        return {"latest": runs, "runs": runs}
+
+    # drop_duplicates, а не groupby().last(): тот пропускает NaN и «склеил» бы проходы
+    latest = runs.sort_values("started_at").drop_duplicates(["network", "contract"], keep="last")
+    last_ok = (
+        runs[runs["error"].isna()].groupby(["network", "contract"])["started_at"].max()
+        .rename("last_ok_at").reset_index()
+    )
+    latest = latest.merge(last_ok, on=["network", "contract"], how="left")
+
+    # голова снята до загрузки: после полного прохода behind_s <= 0, иначе батч
+    # оборвался (лимит страниц, ошибка запроса) или строки не сохранились
+    latest["behind_s"] = (latest["head_ts"] - latest["last_tx_ts"].fillna(0)).clip(lower=0)
+    latest["data_age_s"] = now - latest["last_tx_ts"]
+    latest["ok_age_s"] = now - latest["last_ok_at"]
+
+    stale = latest["ok_age_s"].isna() | (latest["ok_age_s"] > INGEST_STALE_MINUTES * 60)
+    latest["status"] = "ok"
+    latest.loc[latest["http_429"] > 0, "status"] = "throttled"
+    latest.loc[latest["behind_s"] > INGEST_BEHIND_SECONDS, "status"] = "behind"
+    latest.loc[stale, "status"] = "stale"
+    latest.loc[latest["error"].notna(), "status"] = "error"
+
+    for col in ("started_at", "last_ok_at"):
+        latest[col] = pd.to_datetime(latest[col], unit="s", utc=True)
+    runs["started_at"] = pd.to_datetime(runs["started_at"], unit="s", utc=True)
+    return {"latest": latest, "runs": runs}
@@ -0,0 +1,153 @@
+# analytics/live.py
+# Живые счётчики метрик в памяти процесса: на (network, contract, type) —
+# кольца бакетов (минуты для суток, часы для недели/месяца) с числом tx,
+# суммой и кошельками. Засев из БД при первом обращении, дальше — события
+# upsert_tx; точность окна — до одного бакета. Только там, где идёт запись.
+import bisect
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from .storage import METRIC_WINDOWS, load_live_seed, subscribe
+from .writer import writer
+
+Key = Tuple[Optional[str], Optional[str], Optional[str]]
+
+BUCKET_SECONDS = {"day": 60, "week": 3600, "month": 3600}
+
+
+class _Window:
+    def __init__(self, seconds: int, bucket_seconds: int):
+        self.seconds = seconds
+        self.bucket_seconds = bucket_seconds
+        self._order: list = []          # отсортированные индексы бакетов
+        self._buckets: dict = {}        # idx -> [count, volume, Counter(wallet)]
+        self.count = 0
+        self.volume = 0.0
+        self.wallets: Counter = Counter()
+
+    def _oldest(self, now: int) -> int:
+        return (now - self.seconds) // self.bucket_seconds
+
+    def add(self, ts: int, wallet: Optional[str], value: float, now: int):
+        idx = ts // self.bucket_seconds
+        if idx < self._oldest(now):
+            return
+        bucket = self._buckets.get(idx)
+        if bucket is None:
+            bucket = self._buckets[idx] = [0, 0.0, Counter()]
+            bisect.insort(self._order, idx)
+        bucket[0] += 1
+        bucket[1] += value
+        self.count += 1
+        self.volume += value
+        if wallet is not None:
+            bucket[2][wallet] += 1
+            self.wallets[wallet] += 1
+
+    def expire(self, now: int):
+        oldest = self._oldest(now)
+        while self._order and self._order[0] < oldest:
+            count, volume, wallets = self._buckets.pop(self._order.pop(0))
+            self.count -= count
+            self.volume -= volume
+            self.wallets.subtract(wallets)
+            for wallet in wallets:
+                if self.wallets[wallet] <= 0:
+                    del self.wallets[wallet]
+
+
+class LiveMetrics:
+    def __init__(self):
+        self.windows = {
+            suffix: (users, _Window(seconds, BUCKET_SECONDS[suffix]))
+            for seconds, suffix, users in METRIC_WINDOWS
+        }
+        self.total_count = 0
+        self.total_volume = 0.0
+        self.all_wallets: set = set()
+        self._lock = threading.Lock()
+
+    def add(self, ts: int, wallet: Optional[str], value: Optional[float], now: int):
+        value = value or 0.0
+        with self._lock:
+            self.total_count += 1
+            self.total_volume += value
+            if wallet is not None:
+                self.all_wallets.add(wallet)
+            for _, window in self.windows.values():
+                window.add(ts, wallet, value, now)
+
+    def snapshot(self, now: Optional[int] = None) -> dict:
+        now = int(time.time()) if now is None else now
+        with self._lock:
+            m = {
+                "unique_wallets": len(self.all_wallets),
+                "total_tx_count": self.total_count,
+                "total_volume": self.total_volume,
+            }
+            for suffix, (users, window) in self.windows.items():
+                window.expire(now)
+                m[users] = len(window.wallets)
+                m[f"tx_{suffix}"] = window.count
+                m[f"volume_{suffix}"] = window.volume
+        return m
+
+
+_states: Dict[Key, LiveMetrics] = {}
+_enabled = False
+
+
+def enable():
+    """Включает живые счётчики; вызывать там, где работает ingestion."""
+    global _enabled
+    subscribe(_on_new_rows)
+    _enabled = True
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _matches(key: Key, row: tuple) -> bool:
+    return all(k is None or k == v for k, v in zip(key, row[:3]))
+
+
+def _on_new_rows(rows: list):
+    # поток писателя, сразу после COMMIT — порядок с засевом гарантирован
+    now = int(time.time())
+    for key, state in list(_states.items()):
+        for row in rows:
+            if _matches(key, row):
+                _, _, _, ts, wallet, value = row
+                state.add(int(ts), wallet, value, now)
+
+
+def _seed(con, key: Key) -> LiveMetrics:
+    if key in _states:
+        return _states[key]
+    now = int(time.time())
+    longest = max(seconds for seconds, _, _ in METRIC_WINDOWS)
+    rows, count, volume, wallets = load_live_seed(con, *key, since=now - longest)
+
+    state = LiveMetrics()
+    for ts, wallet, value in rows:
+        for _, window in state.windows.values():
+            window.add(int(ts), wallet, value or 0.0, now)
+    state.total_count = count
+    state.total_volume = volume
+    state.all_wallets = set(wallets)
+    _states[key] = state
+    return state
+
+
+def get_live_metrics(
+    network: Optional[str], contract: Optional[str], type_: Optional[str]
+) -> dict:
+    key = (network, contract, type_)
+    state = _states.get(key)
+    if state is None:
+        # засев в потоке писателя: между чтением истории и регистрацией нет записей
+        state = writer.submit(lambda c: _seed(c, key), transaction=False).wait()
+    return state.snapshot()
@@ -0,0 +1,67 @@
+# analytics/maintenance.py
+import os
+import sqlite3
+import time
+from config import DB_PATH, MAINTENANCE_QUIET_MIN_HOURS
+
+from .db import checkpoint
+from .writer import writer
+
+_last_run = 0.0
+
+
+def db_stats(con: sqlite3.Connection, path: str = DB_PATH) -> dict:
+    page_count = con.execute("PRAGMA page_count").fetchone()[0]
+    freelist = con.execute("PRAGMA freelist_count").fetchone()[0]
+    wal_path = path + "-wal"
+    return {
+        "file_bytes": os.path.getsize(path) if os.path.exists(path) else 0,
+        "wal_bytes": os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+        "page_count": page_count,
+        "freelist_count": freelist,
+        "fragmentation": round(freelist / page_count, 4) if page_count else 0.0,
+    }
+
+
+def _maintain(con: sqlite3.Connection) -> dict:
+    before = db_stats(con)
+
+    # статистика для планировщика запросов
+    has_stats = con.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+    ).fetchone()
+    con.execute("PRAGMA optimize" if has_stats else "ANALYZE")
+
+    # файл, созданный без auto_vacuum, один раз переводим полным VACUUM
+    if con.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        con.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        con.execute("VACUUM")
+    con.execute("PRAGMA incremental_vacuum")
+    checkpoint(con, "TRUNCATE")
+
+    return {"before": before, "after": db_stats(con)}
+
+
+def run_maintenance() -> dict:
+    """ANALYZE/optimize, incremental_vacuum и wal_checkpoint(TRUNCATE) в потоке писателя."""
+    global _last_run
+    started = time.perf_counter()
+    report = writer.submit(_maintain, transaction=False).wait()
+    _last_run = time.time()
+
+    before, after = report["before"], report["after"]
+    print(
+        f"[DB] maintenance done in {time.perf_counter() - started:.2f}s: "
+        f"{before['file_bytes'] / 1e6:.2f}MB (+{before['wal_bytes'] / 1e6:.2f}MB wal, "
+        f"frag {before['fragmentation']:.1%}) -> "
+        f"{after['file_bytes'] / 1e6:.2f}MB (+{after['wal_bytes'] / 1e6:.2f}MB wal, "
+        f"frag {after['fragmentation']:.1%})"
+    )
+    return report
+
+
+def maybe_run_maintenance():
+    # вызывается после цикла синхронизации без новых данных — «тихий» период
+    if time.time() - _last_run >= MAINTENANCE_QUIET_MIN_HOURS * 3600:
+        return run_maintenance()
+    return None
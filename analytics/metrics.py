@@ -1,8 +1,52 @@
+import os
+import time
 from typing import Optional, Sequence
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
-from .storage import query_transactions
+from config import CACHE_DISK, DB_PATH, RESULT_CACHE_PATH
+
+from . import live
+from .address import canonical_address
+from .cache import DiskCache, ResultCache, cached
+from .storage import (
+    get_data_version,
+    Spec,
+    query_transactions,
+    query_new_users,
+    query_wallet_stats,
+    query_metrics,
+    query_metrics_many,
+    query_buckets,
+    query_buckets_many,
+    query_page,
+)
+
+# один кэш на процесс: общий для всех страниц и сессий Streamlit
+result_cache = ResultCache()
+# второй уровень — на диске, общий с другими процессами (API, экспорт); ключи — в пространстве этой базы
+disk_cache = DiskCache(RESULT_CACHE_PATH, namespace=os.path.realpath(DB_PATH)) if CACHE_DISK else None
+_cached = cached(result_cache, get_data_version, disk_cache)
+
+
+def cache_stats() -> dict:
+    return result_cache.stats()
+
+
+PERIODS_IN_SECONDS = {
+    "daily": 86400,
+    "weekly": 86400 * 7,
+    "monthly": 86400 * 30,
+    "all": None,
+}
+
+
+METRIC_KEYS = [
+    "unique_wallets", "dau", "wau", "mau",
+    "total_tx_count", "tx_day", "tx_week", "tx_month",
+    "total_volume", "volume_day", "volume_week", "volume_month",
+]
 
 
 def load_df(network: str, contract: str, type_: Optional[str] = None, wallet: Optional[str] = None) -> pd.DataFrame:
@@ -10,7 +54,7 @@ def load_df(network: str, contract: str, type_: Optional[str] = None, wallet: Op
 
 
 def filter_timeframe(df: pd.DataFrame, seconds: int) -> pd.DataFrame:
-    cutoff = pd.Timestamp.utcnow() - pd.Timedelta(seconds=seconds)
+    cutoff = pd.Timestamp.now(tz="UTC") - pd.Timedelta(seconds=seconds)
     return df[df["timestamp"] >= cutoff]
 
 
@@ -20,60 +64,196 @@ def get_metrics(
     type_: Optional[str] = None,
     wallet: Optional[str] = None,
 ) -> dict:
-    df = query_transactions(network, contract, type_, wallet)
+    if wallet is None and live.is_enabled():
+        m = live.get_live_metrics(network, contract, type_)
+        return {key: m[key] for key in METRIC_KEYS}
+    return _sql_metrics(network, contract, type_, wallet)
+
+
+@_cached
+def _sql_metrics(network, contract, type_, wallet) -> dict:
+    m = query_metrics(network, contract, type_, wallet)
+    return {key: m[key] for key in METRIC_KEYS}
+
+
+def _window(period: str):
+    """(начало окна в unix-сек или None, размер бакета в секундах)."""
+    if period not in PERIODS_IN_SECONDS:
+        raise ValueError(f"Invalid period: {period}")
+    seconds = PERIODS_IN_SECONDS[period]
+    since = None
+    if seconds is not None:
+        since = int(time.time()) - seconds
+    return since, 3600 if period == "daily" else 86400
+
+
+# число бакетов на графике: 24 часа, 8 и 31 день (включая текущий)
+DENSE_BUCKETS = {"daily": 24, "weekly": 8, "monthly": 31}
+
+
+def dense_series(df: pd.DataFrame, period: str, now: Optional[int] = None) -> pd.DataFrame:
+    """Непрерывный ряд бакетов периода (UTC) с нулями в пустых.
 
+    df — уже агрегированные бакеты (period + числовые колонки); значения
+    раскладываются по индексам (period - start) // bucket без повторной
+    группировки. "all" — от первого бакета до текущего дня.
+    """
+    _, bucket_seconds = _window(period)
+    now = int(time.time()) if now is None else now
+    end = now // bucket_seconds * bucket_seconds
+
+    keys = pd.DatetimeIndex(df["period"]).as_unit("s").asi8
+    if period == "all":
+        start = int(keys.min()) // bucket_seconds * bucket_seconds if len(keys) else end + bucket_seconds
+    else:
+        start = end - (DENSE_BUCKETS[period] - 1) * bucket_seconds
+    n = max((end - start) // bucket_seconds + 1, 0)
+
+    idx = (keys - start) // bucket_seconds
+    inside = (idx >= 0) & (idx < n)
+    idx = idx[inside]
+
+    out = {"period": pd.to_datetime(start + np.arange(n, dtype="int64") * bucket_seconds, unit="s", utc=True)}
+    for col in df.columns:
+        if col == "period" or not pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        values = df[col].to_numpy()
+        filled = np.zeros(n, dtype=values.dtype)
+        np.add.at(filled, idx, values[inside])
+        out[col] = filled
+    return pd.DataFrame(out)
+
+
+@_cached
+def get_time_series(
+    network: str,
+    contract: str,
+    type_: Optional[str] = None,
+    period: str = "daily",
+    engine: str = "sql",
+) -> pd.DataFrame:
+    """engine="sql" — бакеты считает SQLite, "pandas" — прежний путь через DataFrame."""
+    if engine == "pandas":
+        return dense_series(_get_time_series_pandas(network, contract, type_, period), period)
+    if engine != "sql":
+        raise ValueError(f"Invalid engine: {engine}")
+
+    since, bucket_seconds = _window(period)
+    df = query_buckets(network, contract, type_, since=since, bucket_seconds=bucket_seconds)
+    df["period"] = pd.to_datetime(df["bucket"], unit="s", utc=True)
+    return dense_series(df[["period", "tx_count", "unique_wallets", "amount"]], period)
+
+
+def _split_metrics(df: pd.DataFrame, specs: list) -> dict:
+    rows = {row["series"]: {key: row[key] for key in METRIC_KEYS} for row in df.to_dict("records")}
+    return {
+        "series": {spec: rows[i] for i, spec in enumerate(specs)},
+        "combined": rows.get(-1),
+    }
+
+
+def calendar_series(df: pd.DataFrame, freq: str, now: Optional[int] = None) -> pd.DataFrame:
+    """Как dense_series, но бакеты календарные (freq pandas: "W-MON", "MS", …) — от первого до текущего."""
     if df.empty:
-        return {
-            "unique_wallets": 0,
-            "dau": 0,
-            "wau": 0,
-            "mau": 0,
-            "total_tx_count": 0,
-            "tx_day": 0,
-            "tx_week": 0,
-            "tx_month": 0,
-            "total_volume": 0.0,
-            "volume_day": 0.0,
-            "volume_week": 0.0,
-            "volume_month": 0.0,
+        return df
+    now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now, unit="s", tz="UTC")
+    index = pd.date_range(df["period"].min(), now, freq=freq, name="period")
+    return df.set_index("period").reindex(index, fill_value=0).reset_index()
+
+
+def _split_buckets(df: pd.DataFrame, specs: list, periods: Sequence[str], dense=dense_series) -> dict:
+    df["period_start"] = pd.to_datetime(df["bucket"], unit="s", utc=True)
+
+    columns = ["period", "tx_count", "unique_wallets", "amount"]
+    empty = pd.DataFrame({
+        "period": pd.Series(dtype=pd.DatetimeTZDtype(tz="UTC")),
+        "tx_count": pd.Series(dtype="int64"),
+        "unique_wallets": pd.Series(dtype="int64"),
+        "amount": pd.Series(dtype="float64"),
+    })
+    result = {}
+    for period in periods:
+        part = df[df["period"] == period]
+        frames = {
+            series: g.sort_values("bucket")
+            .drop(columns="period")
+            .rename(columns={"period_start": "period"})[columns]
+            .reset_index(drop=True)
+            for series, g in part.groupby("series")
         }
+        result[period] = {
+            "series": {spec: dense(frames.get(i, empty), period) for i, spec in enumerate(specs)},
+            "combined": dense(frames.get(-1, empty), period),
+        }
+    return result
+
+
+@_cached
+def get_metrics_many(specs: Sequence[Spec]) -> dict:
+    """{"series": {spec: metrics}, "combined": metrics} — одним запросом.
+
+    spec = (network, contract, type); None в любом поле — без фильтра.
+    В "combined" уникальные кошельки считаются по объединению, а не суммой.
+    """
+    specs = [tuple(spec) for spec in specs]
+    return _split_metrics(query_metrics_many(specs), specs)
+
+
+@_cached
+def get_time_series_many(
+    specs: Sequence[Spec],
+    periods: Sequence[str] = ("daily", "weekly", "monthly", "all"),
+) -> dict:
+    """{period: {"series": {spec: df}, "combined": df}} — все ряды одним запросом (плотные)."""
+    specs = [tuple(spec) for spec in specs]
+    windows = [(period, *_window(period)) for period in periods]
+    return _split_buckets(query_buckets_many(specs, windows), specs, periods)
 
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s", utc=True)
 
-    # Временные окна
-    daily = filter_timeframe(df, 86400)
-    weekly = filter_timeframe(df, 86400 * 7)
-    monthly = filter_timeframe(df, 86400 * 30)
+@_cached
+def get_calendar_series(specs: Sequence[Spec], freq: str) -> dict:
+    """{"series": {spec: df}, "combined": df} за всё время в календарных бакетах freq.
 
+    Для укрупнения графиков: unique_wallets считается SQLite на новом шаге —
+    сумма дневных distinct-счётчиков завысила бы число пользователей.
+    """
+    specs = [tuple(spec) for spec in specs]
+    buckets = query_buckets_many(specs, [(freq, None, freq)])
+    return _split_buckets(buckets, specs, [freq], dense=calendar_series)[freq]
+
+
+def get_page_data(specs: Sequence[Spec], periods: Sequence[str] = ()) -> dict:
+    """Всё для отрисовки страницы одним обращением к БД.
+
+    {"metrics": {spec: metrics}, "series": {period: {spec: df}}}. Метрики без
+    запроса берутся из живых счётчиков, если они включены; остальное — одна
+    транзакция чтения (storage.query_page).
+    """
+    specs = [tuple(spec) for spec in specs]
+    if live.is_enabled():
+        data = _page_data(specs, tuple(periods), with_metrics=False)
+        data["metrics"] = {spec: get_metrics(*spec) for spec in specs}
+        return data
+    return _page_data(specs, tuple(periods), with_metrics=True)
+
+
+@_cached
+def _page_data(specs: Sequence[Spec], periods: Sequence[str], with_metrics: bool) -> dict:
+    windows = [(period, *_window(period)) for period in periods]
+    metrics, buckets = query_page(specs, windows, with_metrics=with_metrics, combined=False)
+    series = _split_buckets(buckets, specs, periods)
     return {
-        "unique_wallets": df["from"].nunique(),
-        "dau": daily["from"].nunique(),
-        "wau": weekly["from"].nunique(),
-        "mau": monthly["from"].nunique(),
-        "total_tx_count": len(df),
-        "tx_day": len(daily),
-        "tx_week": len(weekly),
-        "tx_month": len(monthly),
-        "total_volume": df["value"].sum(),
-        "volume_day": daily["value"].sum(),
-        "volume_week": weekly["value"].sum(),
-        "volume_month": monthly["value"].sum(),
+        "metrics": _split_metrics(metrics, specs)["series"] if metrics is not None else None,
+        "series": {period: series[period]["series"] for period in periods},
     }
 
 
-def get_time_series(
+def _get_time_series_pandas(
     network: str,
     contract: str,
     type_: Optional[str] = None,
     period: str = "daily",
 ) -> pd.DataFrame:
-    PERIODS_IN_SECONDS = {
-        "daily": 86400,
-        "weekly": 86400 * 7,
-        "monthly": 86400 * 30,
-        "all": None,
-    }
-
     if period not in PERIODS_IN_SECONDS:
         raise ValueError(f"Invalid period: {period}")
 
@@ -84,13 +264,13 @@ def get_time_series(
     if seconds is not None:
         df = filter_timeframe(df, seconds)
 
-    df["period"] = df["timestamp"].dt.floor("h" if period == "daily" else "d")
+    df["period"] = df["timestamp"].dt.floor("h" if period == "daily" else "D")
 
     return (
         df.groupby("period")
         .agg(
             tx_count=("tx_hash", "count"),
-            unique_wallets=("from", "nunique"),
+            unique_wallets=("wallet", "nunique"),
             amount=("value", "sum"),
         )
         .reset_index()
@@ -98,40 +278,49 @@ def get_time_series(
     )
 
 
-def get_wallet_rewards(
-    wallet: str,
-    contracts: Optional[Sequence[str]] = None,
+@_cached
+def get_new_users_series(
     types: Optional[Sequence[str]] = None,
-) -> dict:
-    wallet = wallet.lower()
-    
-    # Получаем все транзакции для указанного кошелька
-    df = query_transactions(wallet=wallet)
+    period: str = "all",
+) -> pd.DataFrame:
+    since, bucket_seconds = _window(period)
+    df = query_new_users(types=types, since=since, bucket_seconds=bucket_seconds)
+    df["period"] = pd.to_datetime(df["bucket"], unit="s", utc=True)
+    return dense_series(df[["period", "new_users"]], period)
 
-    if df.empty:
-        return {
-            "tx_count": 0,
-            "total_value": 0.0,
-            "last_tx": None
-        }
 
-    # Приводим к нижнему регистру, если столбцы существуют
-    if "contract" in df.columns:
-        df["contract"] = df["contract"].str.lower()
-    if "type" in df.columns:
-        df["type"] = df["type"].str.lower()
+@_cached
+def get_wallet_rewards_many(
+    wallets: Sequence[str],
+    contracts: Optional[Sequence[str]] = None,
+    types: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Сводка по списку кошельков (например, из CSV) одним запросом к wallet_stats.
 
-    # Фильтрация по контрактам
-    if contracts:
-        contracts = [c.lower() for c in contracts]
-        df = df[df["contract"].isin(contracts)]
+    Строка на каждый уникальный адрес в порядке ввода; ненайденные — с нулями.
+    address — адрес в том виде, в каком он был передан (для join с вводом),
+    wallet — канонический, по которому идёт поиск.
+    """
+    addresses = list(dict.fromkeys(w.strip() for w in wallets if w and w.strip()))
+    df = pd.DataFrame({"address": addresses, "wallet": [canonical_address(a) for a in addresses]})
+    found = query_wallet_stats(list(dict.fromkeys(df["wallet"])), contracts, types).set_index("wallet")
 
-    # Фильтрация по типам
-    if types:
-        types = [t.lower() for t in types]
-        df = df[df["type"].isin(types)]
+    df["tx_count"] = df["wallet"].map(found["tx_count"]).fillna(0).astype("int64")
+    df["total_value"] = df["wallet"].map(found["total_value"]).fillna(0.0)
+    df["last_tx"] = pd.to_datetime(df["wallet"].map(found["last_ts"]), unit="s")
+    return df
 
-    if df.empty:
+
+@_cached
+def get_wallet_rewards(
+    wallet: str,
+    contracts: Optional[Sequence[str]] = None,
+    types: Optional[Sequence[str]] = None,
+) -> dict:
+    df = get_wallet_rewards_many([wallet], contracts, types)
+    # пустой / из пробелов адрес отфильтрован — как и раньше, нули
+    row = df.iloc[0] if not df.empty else None
+    if row is None or row["tx_count"] == 0:
         return {
             "tx_count": 0,
             "total_value": 0.0,
@@ -139,12 +328,13 @@ def get_wallet_rewards(
         }
 
     return {
-        "tx_count": len(df),
-        "total_value": df["value"].sum(),
-        "last_tx": df["timestamp"].max().isoformat()
+        "tx_count": int(row["tx_count"]),
+        "total_value": float(row["total_value"]),
+        "last_tx": row["last_tx"].isoformat()
     }
 
 
+@_cached
 def get_total_amount(
     contract: str,
     type_: str,
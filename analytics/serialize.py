@@ -0,0 +1,28 @@
+# analytics/serialize.py
+# JSON для машинных потребителей: статический экспорт и HTTP API.
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return None if pd.isna(value) else value.isoformat()
+    raise TypeError(f"not JSON serializable: {type(value).__name__}")
+
+
+def records(df: pd.DataFrame) -> list:
+    """Строки df; колонки-даты — ISO 8601 UTC, NaT — null."""
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            values = pd.to_datetime(df[col], utc=True).dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+            df[col] = values.astype(object).where(df[col].notna(), None)
+    return df.to_dict("records")
+
+
+def dumps(value) -> str:
+    return json.dumps(value, default=json_default, ensure_ascii=False)
@@ -1,51 +1,305 @@
 # analytics/storage.py
 import os
+import time
+import zlib
+import base64
+import json
 import sqlite3
-from contextlib import contextmanager
+import threading
 import pandas as pd
-from typing import Literal, Optional
-from config import DB_PATH
+from typing import Callable, List, Literal, Optional, Sequence, Tuple
+from functools import partial
+from config import INGEST_STATS_RETENTION_DAYS, READ_FROM_SNAPSHOT
+from .address import canonical_address
+from .db import read_conn, checkpoint, refresh_snapshot
+from .writer import Ticket, writer
 
 os.makedirs("data", exist_ok=True)
 
+TX_COLUMNS = [
+    "tx_hash", "timestamp", "block", "from", "to",
+    "value", "network", "contract", "type", "wallet",
+]
 
-@contextmanager
-def _conn():
-    con = sqlite3.connect(DB_PATH)
-    con.execute("PRAGMA journal_mode=WAL")  # безопаснее параллельная запись
-    try:
-        yield con
-    finally:
-        con.commit()
-        con.close()
+
+_init_lock = threading.Lock()
+_initialized = False
 
 
 def init_db():
-    with _conn() as c:
-        c.execute(
-            """
-            CREATE TABLE IF NOT EXISTS transactions (
-                tx_hash     TEXT PRIMARY KEY,
-                timestamp   INTEGER,
-                block       INTEGER,
-                "from"      TEXT,
-                "to"        TEXT,
-                value       REAL,
-                network     TEXT,
-                contract    TEXT,
-                type        TEXT,
-                data        TEXT
-            )
-            """
+    """Схема и миграции; вызывается явно точками входа, выполняется раз на процесс."""
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        writer.submit(_create_schema).wait()
+        _initialized = True
+    print("SQLite ready ✨")
+
+
+def _create_schema(c: sqlite3.Connection):
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS transactions (
+            tx_hash     TEXT PRIMARY KEY,
+            timestamp   INTEGER,
+            block       INTEGER,
+            "from"      TEXT,
+            "to"        TEXT,
+            value       REAL,
+            network     TEXT,
+            contract    TEXT,
+            type        TEXT,
+            wallet      TEXT
         )
-        c.execute(
-            "CREATE INDEX IF NOT EXISTS idx_net_ctr ON transactions (network, contract)"
+        """
+    )
+    _migrate_wallet_column(c)
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_net_ctr ON transactions (network, contract)"
+    )
+    # поиск по кошельку — точное равенство канонического адреса
+    c.execute("CREATE INDEX IF NOT EXISTS idx_wallet ON transactions (wallet)")
+    # покрывающий индекс для агрегатов: окна по timestamp без чтения строк таблицы;
+    # уникальные пользователи считаются по wallet — прежний индекс был по "from"
+    c.execute("DROP INDEX IF EXISTS idx_ctr_type_ts")
+    c.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_ctr_type_ts_wallet
+        ON transactions (network, contract, type, timestamp, wallet, value)
+        """
+    )
+    # версия данных: растёт на каждом commit'е с новыми транзакциями (ключ кэшей)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS meta (
+            key         TEXT PRIMARY KEY,
+            value       INTEGER
         )
-    print("SQLite ready ✨")
+        """
+    )
+    c.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0)")
+    # сырые input / BOC — сжатые BLOB'ы отдельно от горячих колонок;
+    # encoding — как восстановить исходную строку (hex / base64 / text)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tx_payloads (
+            tx_hash     TEXT PRIMARY KEY,
+            data        BLOB,
+            encoding    TEXT
+        )
+        """
+    )
+    _migrate_payload_encoding(c)
+    _migrate_payloads(c)
+    # первый визит кошелька: MIN(timestamp) по (wallet, network, contract, type);
+    # wallet — канонический адрес, как в wallet_stats
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS wallet_first_seen (
+            wallet      TEXT,
+            network     TEXT,
+            contract    TEXT,
+            type        TEXT,
+            first_ts    INTEGER,
+            PRIMARY KEY (wallet, network, contract, type)
+        )
+        """
+    )
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_wfs_type ON wallet_first_seen (type, wallet, first_ts)"
+    )
+    _migrate_first_seen_key(c)
+    # одноразовое заполнение из уже накопленной истории
+    c.execute(
+        """
+        INSERT INTO wallet_first_seen (wallet, network, contract, type, first_ts)
+        SELECT wallet, network, contract, type, MIN(CAST(timestamp AS INTEGER))
+        FROM transactions
+        WHERE wallet IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM wallet_first_seen)
+        GROUP BY wallet, network, contract, type
+        """
+    )
+    # агрегаты по кошельку для поиска: ключ — канонический адрес
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS wallet_stats (
+            wallet      TEXT,
+            network     TEXT,
+            contract    TEXT,
+            type        TEXT,
+            tx_count    INTEGER,
+            total_value REAL,
+            last_ts     INTEGER,
+            PRIMARY KEY (wallet, network, contract, type)
+        ) WITHOUT ROWID
+        """
+    )
+    c.execute(
+        """
+        INSERT INTO wallet_stats (wallet, network, contract, type, tx_count, total_value, last_ts)
+        SELECT wallet, network, contract, type,
+               COUNT(*), TOTAL(value), MAX(CAST(timestamp AS INTEGER))
+        FROM transactions
+        WHERE wallet IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM wallet_stats)
+        GROUP BY wallet, network, contract, type
+        """
+    )
+    # верхняя отметка по контракту: последний блок и время сохранённых транзакций
+    _migrate_progress(c)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS progress (
+            network     TEXT,
+            contract    TEXT,
+            last_block  INTEGER,
+            last_ts     INTEGER,
+            PRIMARY KEY (network, contract)
+        ) WITHOUT ROWID
+        """
+    )
+    c.execute(
+        """
+        INSERT INTO progress (network, contract, last_block, last_ts)
+        SELECT network, contract, MAX(CAST(block AS INTEGER)), MAX(CAST(timestamp AS INTEGER))
+        FROM transactions
+        WHERE NOT EXISTS (SELECT 1 FROM progress)
+        GROUP BY network, contract
+        """
+    )
+    # журнал проходов загрузки (analytics.ingest_stats); data_version не трогает
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_runs (
+            started_at      REAL,
+            network         TEXT,
+            name            TEXT,
+            contract        TEXT,
+            fetch_ms        REAL,
+            decode_ms       REAL,
+            transform_ms    REAL,
+            upsert_ms       REAL,
+            total_ms        REAL,
+            requests        INTEGER,
+            http_429        INTEGER,
+            rows_fetched    INTEGER,
+            rows_inserted   INTEGER,
+            rows_ignored    INTEGER,
+            head_block      INTEGER,
+            last_block      INTEGER,
+            head_ts         INTEGER,
+            last_tx_ts      INTEGER,
+            error           TEXT
+        )
+        """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_ingest_ts ON ingest_runs (started_at)")
+
+
+def _pack_payload(raw) -> Optional[Tuple[bytes, str]]:
+    """(сжатые байты, encoding) или None для пустого payload.
+
+    EVM input приходит как 0x-hex, TON data — как base64 BOC. Байтами хранится
+    только то, из чего unpack вернёт ровно исходную строку, остальное — текстом.
+    """
+    if not isinstance(raw, str) or raw in ("", "0x"):
+        return None
+    blob, encoding = raw.encode(), "text"
+    try:
+        if raw.startswith("0x"):
+            decoded = bytes.fromhex(raw[2:])
+            if "0x" + decoded.hex() == raw:
+                blob, encoding = decoded, "hex"
+        else:
+            decoded = base64.b64decode(raw, validate=True)
+            if base64.b64encode(decoded).decode() == raw:
+                blob, encoding = decoded, "base64"
+    except ValueError:  # binascii.Error — подкласс ValueError
+        pass
+    return zlib.compress(blob), encoding
+
+
+def _unpack_payload(data: bytes, encoding: str) -> str:
+    blob = zlib.decompress(data)
+    if encoding == "hex":
+        return "0x" + blob.hex()
+    if encoding == "base64":
+        return base64.b64encode(blob).decode()
+    return blob.decode()
+
+
+def _migrate_payload_encoding(c: sqlite3.Connection):
+    cols = [row[1] for row in c.execute("PRAGMA table_info(tx_payloads)")]
+    if "encoding" in cols:
+        return
+
+    c.execute("ALTER TABLE tx_payloads ADD COLUMN encoding TEXT")
+    # прежние строки писались без флага: BASE — hex, TON — base64
+    c.execute(
+        """
+        UPDATE tx_payloads SET encoding = CASE (
+            SELECT network FROM transactions t WHERE t.tx_hash = tx_payloads.tx_hash
+        ) WHEN 'TON' THEN 'base64' ELSE 'hex' END
+        """
+    )
+    print("[DB] added payload encoding flag")
+
+
+def _migrate_payloads(c: sqlite3.Connection):
+    cols = [row[1] for row in c.execute("PRAGMA table_info(transactions)")]
+    if "data" not in cols:
+        return
+
+    rows = c.execute(
+        "SELECT tx_hash, data FROM transactions WHERE data IS NOT NULL"
+    ).fetchall()
+    c.executemany(
+        "INSERT OR IGNORE INTO tx_payloads (tx_hash, data, encoding) VALUES (?, ?, ?)",
+        [(h, *packed) for h, raw in rows if (packed := _pack_payload(raw)) is not None],
+    )
+    c.execute("ALTER TABLE transactions DROP COLUMN data")
+    print(f"[DB] moved {len(rows)} payloads to tx_payloads")
+
+
+def _migrate_wallet_column(c: sqlite3.Connection):
+    cols = [row[1] for row in c.execute("PRAGMA table_info(transactions)")]
+    if "wallet" in cols:
+        return
+
+    c.execute("ALTER TABLE transactions ADD COLUMN wallet TEXT")
+    c.create_function("canonical_address", 1, canonical_address, deterministic=True)
+    c.execute('UPDATE transactions SET wallet = canonical_address("from")')
+    # агрегаты и первые визиты были по сырому "from" — пересобираются по новому ключу
+    c.execute("DROP TABLE IF EXISTS wallet_stats")
+    c.execute("DROP TABLE IF EXISTS wallet_first_seen")
+    print("[DB] added canonical wallet column")
+
+
+def _migrate_first_seen_key(c: sqlite3.Connection):
+    # базы, где колонка wallet уже была, а wallet_first_seen заполнялась по "from"
+    stale = c.execute(
+        """
+        SELECT 1 FROM wallet_first_seen f
+        WHERE NOT EXISTS (SELECT 1 FROM transactions t WHERE t.wallet = f.wallet)
+        LIMIT 1
+        """
+    ).fetchone()
+    if stale:
+        c.execute("DELETE FROM wallet_first_seen")
+        print("[DB] rebuilding wallet_first_seen by canonical wallet")
+
+
+def _migrate_progress(c: sqlite3.Connection):
+    cols = [row[1] for row in c.execute("PRAGMA table_info(progress)")]
+    if cols and "last_ts" not in cols:
+        # старая таблица без времени — производная, заполняется заново из transactions
+        c.execute("DROP TABLE progress")
 
 
 def get_last_block(network: str, contract: str) -> int:
-    with _conn() as c:
+    with read_conn() as c:
         cur = c.execute(
             "SELECT last_block FROM progress WHERE network=? AND contract=?",
             (network, contract),
@@ -53,18 +307,437 @@ def get_last_block(network: str, contract: str) -> int:
     return cur[0] if cur else 0
 
 
-def upsert_tx(df: pd.DataFrame):
-    if df.empty:
+# ---------- insert events ----------
+NEW_TX_COLUMNS = ["network", "contract", "type", "timestamp", "wallet", "value"]
+_listeners: List[Callable[[list], None]] = []
+
+
+def subscribe(callback: Callable[[list], None]):
+    """callback(rows) после commit'а; rows — кортежи NEW_TX_COLUMNS только новых транзакций."""
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def _notify(rows: list):
+    if not rows:
         return
-    with _conn() as c:
-        df.to_sql("tmp_tx", c, if_exists="replace", index=False)
-        c.execute(
-            """
-            INSERT OR IGNORE INTO transactions
-            SELECT * FROM tmp_tx;
-            """
+    for callback in list(_listeners):
+        try:
+            callback(rows)
+        except Exception as e:
+            print(f"[DB] listener {callback.__name__} failed: {e}")
+
+
+def upsert_tx(df: pd.DataFrame) -> int:
+    """Пишет батч через очередь писателя и ждёт commit'а; возвращает число новых строк."""
+    ticket = upsert_tx_async(df)
+    return len(ticket.wait()) if ticket is not None else 0
+
+
+def upsert_tx_async(df: pd.DataFrame) -> Optional[Ticket]:
+    """Ставит батч в очередь писателя без ожидания; None для пустого батча.
+
+    ticket.wait() — список новых строк (кортежи NEW_TX_COLUMNS).
+    """
+    if df.empty:
+        return None
+    return writer.submit(partial(_write_tx, df=df), on_commit=_notify)
+
+
+def _write_tx(c: sqlite3.Connection, df: pd.DataFrame) -> list:
+    if "wallet" not in df.columns and "from" in df.columns:
+        df = df.assign(wallet=df["from"].map(canonical_address))
+    cols = [col for col in TX_COLUMNS if col in df.columns]
+    col_list = ", ".join(f'"{col}"' for col in cols)
+    rows = df[cols].astype(object).where(df[cols].notna(), None).values.tolist()
+
+    # батч во временной таблице (temp_store=MEMORY) — основной файл не фрагментируется
+    c.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS tmp_tx (
+            tx_hash     TEXT PRIMARY KEY,
+            timestamp   INTEGER,
+            block       INTEGER,
+            "from"      TEXT,
+            "to"        TEXT,
+            value       REAL,
+            network     TEXT,
+            contract    TEXT,
+            type        TEXT,
+            wallet      TEXT
+        )
+        """
+    )
+    c.execute("DELETE FROM tmp_tx")
+    c.executemany(
+        f"INSERT OR IGNORE INTO tmp_tx ({col_list}) VALUES ({', '.join('?' * len(cols))})",
+        rows,
+    )
+    # дальше работаем только с действительно новыми транзакциями
+    c.execute("DELETE FROM tmp_tx WHERE tx_hash IN (SELECT tx_hash FROM transactions)")
+    new_rows = c.execute(
+        "SELECT network, contract, type, timestamp, wallet, value FROM tmp_tx"
+    ).fetchall()
+
+    c.execute(
+        f"""
+        INSERT OR IGNORE INTO transactions ({col_list})
+        SELECT {col_list} FROM tmp_tx
+        """
+    )
+    if "data" in df.columns:
+        c.executemany(
+            "INSERT OR IGNORE INTO tx_payloads (tx_hash, data, encoding) VALUES (?, ?, ?)",
+            (
+                (h, *packed)
+                for h, raw in zip(df["tx_hash"], df["data"])
+                if (packed := _pack_payload(raw)) is not None
+            ),
         )
-        c.execute("DROP TABLE tmp_tx")
+    c.execute(
+        """
+        INSERT INTO progress (network, contract, last_block, last_ts)
+        SELECT network, contract, MAX(CAST(block AS INTEGER)), MAX(CAST(timestamp AS INTEGER))
+        FROM tmp_tx
+        GROUP BY network, contract
+        ON CONFLICT (network, contract) DO UPDATE SET
+            last_block = MAX(IFNULL(last_block, 0), IFNULL(excluded.last_block, 0)),
+            last_ts = MAX(IFNULL(last_ts, 0), IFNULL(excluded.last_ts, 0))
+        """
+    )
+    c.execute(
+        """
+        INSERT INTO wallet_first_seen (wallet, network, contract, type, first_ts)
+        SELECT wallet, network, contract, type, MIN(timestamp)
+        FROM tmp_tx
+        WHERE wallet IS NOT NULL
+        GROUP BY wallet, network, contract, type
+        ON CONFLICT (wallet, network, contract, type)
+        DO UPDATE SET first_ts = MIN(first_ts, excluded.first_ts)
+        """
+    )
+    c.execute(
+        """
+        INSERT INTO wallet_stats (wallet, network, contract, type, tx_count, total_value, last_ts)
+        SELECT wallet, network, contract, type, COUNT(*), TOTAL(value), MAX(timestamp)
+        FROM tmp_tx
+        WHERE wallet IS NOT NULL
+        GROUP BY wallet, network, contract, type
+        ON CONFLICT (wallet, network, contract, type) DO UPDATE SET
+            tx_count = tx_count + excluded.tx_count,
+            total_value = total_value + excluded.total_value,
+            last_ts = MAX(last_ts, excluded.last_ts)
+        """
+    )
+    if new_rows:
+        c.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+    return new_rows
+
+
+# ---------- ingestion runs ----------
+INGEST_COLUMNS = [
+    "started_at", "network", "name", "contract",
+    "fetch_ms", "decode_ms", "transform_ms", "upsert_ms", "total_ms",
+    "requests", "http_429", "rows_fetched", "rows_inserted", "rows_ignored",
+    "head_block", "last_block", "head_ts", "last_tx_ts", "error",
+]
+
+
+def record_ingest_run(row: dict):
+    """Запись прохода загрузки; last_block / last_tx_ts — верхняя отметка из progress."""
+    writer.submit(partial(_write_ingest_run, row=row)).wait()
+
+
+def _write_ingest_run(c: sqlite3.Connection, row: dict):
+    # поиск по первичному ключу — писатель не сканирует transactions
+    mark = c.execute(
+        "SELECT last_block, last_ts FROM progress WHERE network = ? AND contract = ?",
+        (row["network"], row["contract"]),
+    ).fetchone()
+    last_block, last_tx_ts = mark or (None, None)
+    row = {**row, "last_block": last_block, "last_tx_ts": last_tx_ts}
+    c.execute(
+        f"INSERT INTO ingest_runs ({', '.join(INGEST_COLUMNS)}) VALUES ({', '.join('?' * len(INGEST_COLUMNS))})",
+        [row.get(col) for col in INGEST_COLUMNS],
+    )
+    c.execute(
+        "DELETE FROM ingest_runs WHERE started_at < ?",
+        (time.time() - INGEST_STATS_RETENTION_DAYS * 86400,),
+    )
+
+
+def query_ingest_runs(since: float) -> pd.DataFrame:
+    with read_conn() as c:
+        return pd.read_sql(
+            f"SELECT {', '.join(INGEST_COLUMNS)} FROM ingest_runs WHERE started_at >= ? ORDER BY started_at",
+            c,
+            params=(since,),
+        )
+
+
+def get_data_version() -> int:
+    with read_conn() as c:
+        row = c.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+    return row[0] if row else 0
+
+
+def load_live_seed(
+    c: sqlite3.Connection,
+    network: Optional[str],
+    contract: Optional[str],
+    type_: Optional[str],
+    since: int,
+) -> Tuple[list, int, float, list]:
+    """Начальное состояние живых счётчиков: строки окна, итоги и все кошельки."""
+    where, params = _spec_where(network, contract, type_)
+    rows = c.execute(
+        f"SELECT timestamp, wallet, value FROM transactions WHERE {where} AND timestamp >= ?",
+        params + [since],
+    ).fetchall()
+    count, volume = c.execute(
+        f"SELECT COUNT(*), TOTAL(value) FROM transactions WHERE {where}", params
+    ).fetchone()
+    wallets = [
+        w for (w,) in c.execute(
+            f"SELECT DISTINCT wallet FROM transactions WHERE {where} AND wallet IS NOT NULL",
+            params,
+        )
+    ]
+    return rows, count, volume, wallets
+
+
+def checkpoint_wal(mode: str = "PASSIVE") -> tuple:
+    # чекпоинт делает владелец пишущего соединения, вне транзакции
+    return writer.submit(lambda c: checkpoint(c, mode), transaction=False).wait()
+
+
+def publish_snapshot():
+    """Обновляет снапшот для читателей, если они на него переключены."""
+    if READ_FROM_SNAPSHOT:
+        writer.flush()
+        refresh_snapshot()
+
+
+METRIC_WINDOWS = [
+    # (окно в секундах, суффикс счётчиков, имя уникальных)
+    (86400, "day", "dau"),
+    (86400 * 7, "week", "wau"),
+    (86400 * 30, "month", "mau"),
+]
+
+
+Spec = Tuple[Optional[str], Optional[str], Optional[str]]  # (network, contract, type); None — любой
+
+
+def _spec_where(
+    network: Optional[str] = None,
+    contract: Optional[str] = None,
+    type_: Optional[str] = None,
+    wallet: Optional[str] = None,
+) -> Tuple[str, list]:
+    clauses, params = [], []
+    if network:
+        clauses.append("network = ?")
+        params.append(network)
+    if contract:
+        clauses.append("contract = ?")
+        params.append(contract)
+    if type_:
+        clauses.append("type = ?")
+        params.append(type_)
+    if wallet:
+        clauses.append("wallet = ?")
+        params.append(canonical_address(wallet))
+    return " AND ".join(clauses) or "1=1", params
+
+
+def _any_spec_where(specs: Sequence[Spec]) -> Tuple[str, list]:
+    parts, params = [], []
+    for spec in specs:
+        where, p = _spec_where(*spec)
+        parts.append(f"({where})")
+        params += p
+    return " OR ".join(parts), params
+
+
+def _metrics_select(now: int) -> Tuple[str, list]:
+    select = [
+        "COUNT(DISTINCT wallet) AS unique_wallets",
+        "COUNT(*) AS total_tx_count",
+        "TOTAL(value) AS total_volume",
+    ]
+    params: list = []
+    for seconds, suffix, users in METRIC_WINDOWS:
+        select += [
+            f"COUNT(DISTINCT CASE WHEN timestamp >= ? THEN wallet END) AS {users}",
+            f"COUNT(CASE WHEN timestamp >= ? THEN 1 END) AS tx_{suffix}",
+            f"TOTAL(CASE WHEN timestamp >= ? THEN value END) AS volume_{suffix}",
+        ]
+        params += [now - seconds] * 3
+    return ", ".join(select), params
+
+
+# пустой результат read_sql приходит с object-колонками — фиксируем типы
+_BUCKETS_DTYPES = {"bucket": "int64", "tx_count": "int64", "unique_wallets": "int64", "amount": "float64"}
+
+_BUCKETS_SELECT = """
+    (timestamp / ?) * ? AS bucket,
+    COUNT(*) AS tx_count,
+    COUNT(DISTINCT wallet) AS unique_wallets,
+    TOTAL(value) AS amount
+"""
+
+# календарные бакеты (частоты pandas) — начало недели / месяца / квартала / года в unix-сек
+_TS = "timestamp, 'unixepoch'"
+CALENDAR_BUCKETS = {
+    "W-MON": f"date({_TS}, '-6 days', 'weekday 1')",
+    "MS": f"date({_TS}, 'start of month')",
+    "QS": f"date({_TS}, 'start of month', '-' || ((CAST(strftime('%m', {_TS}) AS INTEGER) - 1) % 3) || ' months')",
+    "YS": f"date({_TS}, 'start of year')",
+}
+
+
+def _bucket_select(bucket) -> Tuple[str, list]:
+    """SELECT бакетов: bucket — размер в секундах или частота из CALENDAR_BUCKETS."""
+    if isinstance(bucket, str):
+        expr = f"CAST(strftime('%s', {CALENDAR_BUCKETS[bucket]}) AS INTEGER)"
+        return _BUCKETS_SELECT.replace("(timestamp / ?) * ?", expr), []
+    return _BUCKETS_SELECT, [bucket, bucket]
+
+
+def query_metrics(
+    network: Optional[str] = None,
+    contract: Optional[str] = None,
+    type_: Optional[str] = None,
+    wallet: Optional[str] = None,
+    now: Optional[int] = None,
+) -> dict:
+    """Счётчики, суммы и уникальные кошельки за day/week/month/all одним агрегатом."""
+    now = int(time.time()) if now is None else now
+    select, params = _metrics_select(now)
+    where, where_params = _spec_where(network, contract, type_, wallet)
+
+    with read_conn() as c:
+        cur = c.execute(
+            f"SELECT {select} FROM transactions WHERE {where}", params + where_params
+        )
+        row = cur.fetchone()
+    return {col[0]: value for col, value in zip(cur.description, row)}
+
+
+def _metrics_many_sql(specs: Sequence[Spec], now: int, combined: bool = True) -> Tuple[str, list]:
+    select, select_params = _metrics_select(now)
+    parts, params = [], []
+    for i, spec in enumerate(specs):
+        where, p = _spec_where(*spec)
+        parts.append(f"SELECT {i} AS series, {select} FROM transactions WHERE {where}")
+        params += select_params + p
+    if combined:
+        where, p = _any_spec_where(specs)
+        parts.append(f"SELECT -1 AS series, {select} FROM transactions WHERE {where}")
+        params += select_params + p
+    return " UNION ALL ".join(parts), params
+
+
+def query_metrics_many(specs: Sequence[Spec], now: Optional[int] = None) -> pd.DataFrame:
+    """Метрики по каждому spec (series = индекс) и по их объединению (series = -1)."""
+    now = int(time.time()) if now is None else now
+    q, params = _metrics_many_sql(specs, now)
+    with read_conn() as c:
+        return pd.read_sql(q, c, params=params)
+
+
+def query_buckets(
+    network: Optional[str] = None,
+    contract: Optional[str] = None,
+    type_: Optional[str] = None,
+    since: Optional[int] = None,
+    bucket_seconds=86400,
+) -> pd.DataFrame:
+    """Агрегаты по бакетам timestamp / bucket_seconds — наружу только сгруппированные строки.
+
+    bucket_seconds может быть частотой из CALENDAR_BUCKETS ("W-MON", "MS", …).
+    """
+    where, params = _spec_where(network, contract, type_)
+    select, select_params = _bucket_select(bucket_seconds)
+    q = f"SELECT {select} FROM transactions WHERE {where}"
+    params = select_params + params
+    if since is not None:
+        q += " AND timestamp >= ?"
+        params.append(since)
+    q += " GROUP BY bucket ORDER BY bucket"
+
+    with read_conn() as c:
+        return pd.read_sql(q, c, params=params, dtype=_BUCKETS_DTYPES)
+
+
+def _buckets_many_sql(
+    specs: Sequence[Spec],
+    windows: Sequence[Tuple[str, Optional[int], int]],
+    combined: bool = True,
+) -> Tuple[str, list]:
+    parts, params = [], []
+    targets = list(enumerate(specs)) + ([(-1, None)] if combined else [])
+    for period, since, bucket_seconds in windows:
+        select, select_params = _bucket_select(bucket_seconds)
+        for i, spec in targets:
+            where, p = _spec_where(*spec) if spec else _any_spec_where(specs)
+            q = f"SELECT ? AS period, {i} AS series, {select} FROM transactions WHERE ({where})"
+            p = [period, *select_params] + p
+            if since is not None:
+                q += " AND timestamp >= ?"
+                p.append(since)
+            parts.append(q + " GROUP BY bucket")
+            params += p
+    return " UNION ALL ".join(parts), params
+
+
+def query_buckets_many(
+    specs: Sequence[Spec],
+    windows: Sequence[Tuple[str, Optional[int], int]],
+) -> pd.DataFrame:
+    """Бакеты для всех spec и окон (period, since, bucket_seconds) одним запросом.
+
+    bucket_seconds — секунды или частота из CALENDAR_BUCKETS.
+
+    series = индекс spec, -1 — объединение всех spec.
+    """
+    q, params = _buckets_many_sql(specs, windows)
+    with read_conn() as c:
+        return pd.read_sql(q, c, params=params, dtype=_BUCKETS_DTYPES)
+
+
+def query_page(
+    specs: Sequence[Spec],
+    windows: Sequence[Tuple[str, Optional[int], int]],
+    with_metrics: bool = True,
+    combined: bool = True,
+    now: Optional[int] = None,
+) -> Tuple[Optional[pd.DataFrame], pd.DataFrame]:
+    """(метрики или None, бакеты) для страницы — в одной транзакции чтения.
+
+    Карточки и графики видят один и тот же снимок БД; форматы результатов —
+    как у query_metrics_many / query_buckets_many.
+    """
+    now = int(time.time()) if now is None else now
+    metrics = None
+    with read_conn() as c:
+        c.execute("BEGIN")
+        try:
+            if with_metrics:
+                q, params = _metrics_many_sql(specs, now, combined)
+                metrics = pd.read_sql(q, c, params=params)
+            if windows:
+                q, params = _buckets_many_sql(specs, windows, combined)
+                buckets = pd.read_sql(q, c, params=params, dtype=_BUCKETS_DTYPES)
+            else:
+                buckets = pd.DataFrame(
+                    {"period": pd.Series(dtype="object"), "series": pd.Series(dtype="int64")}
+                    | {col: pd.Series(dtype=dtype) for col, dtype in _BUCKETS_DTYPES.items()}
+                )
+        finally:
+            c.execute("COMMIT")
+    return metrics, buckets
 
 
 def query_transactions(
@@ -73,7 +746,7 @@ def query_transactions(
     type_: Optional[str] = None,
     wallet: Optional[str] = None,
 ) -> pd.DataFrame:
-    q = 'SELECT timestamp, contract, type, "from", "to", value, tx_hash FROM transactions WHERE 1=1'
+    q = 'SELECT timestamp, contract, type, "from", "to", value, tx_hash, wallet FROM transactions WHERE 1=1'
     params = []
     if network:
         q += " AND network = ?"
@@ -85,26 +758,89 @@ def query_transactions(
         q += " AND type = ?"
         params.append(type_)
     if wallet:
-        q += ' AND "from" = ? COLLATE NOCASE'
-        params.append(wallet)
+        q += " AND wallet = ?"
+        params.append(canonical_address(wallet))
 
-    with _conn() as c:
+    with read_conn() as c:
         df = pd.read_sql(q, c, params=params)
     df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
     return df
 
 
+def query_wallet_stats(
+    wallets: Sequence[str],
+    contracts: Optional[Sequence[str]] = None,
+    types: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """tx_count / total_value / last_ts по каждому найденному кошельку — один запрос.
+
+    Кошельки передаются JSON-массивом (json_each), так что лимит на число
+    параметров не мешает спискам в тысячи адресов; поиск идёт по первичному
+    ключу wallet_stats. Адреса приводятся к канонической форме (EQ…/UQ…/0:…
+    совпадают); contracts/types сравниваются без учёта регистра.
+    """
+    q = """
+        SELECT wallet, SUM(tx_count) AS tx_count, TOTAL(total_value) AS total_value,
+               MAX(last_ts) AS last_ts
+        FROM wallet_stats
+        WHERE wallet IN (SELECT value FROM json_each(?))
+    """
+    params: list = [json.dumps([canonical_address(w) for w in wallets])]
+    if contracts:
+        q += f" AND lower(contract) IN ({','.join('?' * len(contracts))})"
+        params.extend(c.lower() for c in contracts)
+    if types:
+        q += f" AND lower(type) IN ({','.join('?' * len(types))})"
+        params.extend(t.lower() for t in types)
+    q += " GROUP BY wallet"
+
+    with read_conn() as c:
+        return pd.read_sql(
+            q, c, params=params,
+            dtype={"wallet": "object", "tx_count": "int64", "total_value": "float64", "last_ts": "int64"},
+        )
+
+
+def query_new_users(
+    types: Optional[Sequence[str]] = None,
+    since: Optional[int] = None,
+    bucket_seconds: int = 86400,
+) -> pd.DataFrame:
+    """Количество новых кошельков по бакетам (по первому появлению среди `types`)."""
+    inner = "SELECT wallet, MIN(first_ts) AS first_ts FROM wallet_first_seen"
+    params: list = []
+    if types:
+        inner += f" WHERE type IN ({','.join('?' * len(types))})"
+        params.extend(types)
+    inner += " GROUP BY wallet"
+
+    q = f"SELECT (first_ts / ?) * ? AS bucket, COUNT(*) AS new_users FROM ({inner})"
+    params = [bucket_seconds, bucket_seconds] + params
+    if since is not None:
+        q += " WHERE first_ts >= ?"
+        params.append(since)
+    q += " GROUP BY bucket ORDER BY bucket"
+
+    with read_conn() as c:
+        return pd.read_sql(q, c, params=params, dtype={"bucket": "int64", "new_users": "int64"})
+
+
+def load_payload(tx_hash: str) -> Optional[str]:
+    """Исходный input (0x-hex, BASE) или BOC (base64, TON) — только по запросу."""
+    with read_conn() as c:
+        row = c.execute(
+            "SELECT data, encoding FROM tx_payloads WHERE tx_hash = ?", (tx_hash,)
+        ).fetchone()
+    return _unpack_payload(*row) if row else None
+
+
 def load_transactions(network: str, contract: str, type_: str) -> pd.DataFrame:
-    with sqlite3.connect(DB_PATH) as conn:
+    with read_conn() as conn:
         query = """
-        SELECT timestamp, type, "from", "to", value, tx_hash, data
+        SELECT timestamp, type, "from", "to", value, tx_hash
         FROM transactions
         WHERE network = ? AND contract = ? AND type = ?
         """
         df = pd.read_sql(query, conn, params=(network, contract, type_))
     df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
     return df
-
-
-# Инициализация БД при запуске
-init_db()
@@ -1,5 +1,4 @@
 import base64, struct
-from tonsdk.boc import Cell
 
 
 def extract_operation_type(tx: dict) -> str:
@@ -17,6 +16,8 @@ def extract_operation_type(tx: dict) -> str:
                 return "EmptyBody"
 
             try:
+                from tonsdk.boc import Cell  # только для raw-тел, не при импорте
+
                 boc = base64.b64decode(body_b64)
                 cell = Cell.one_from_boc(boc)
                 sl = cell.begin_parse()
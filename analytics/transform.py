@@ -1,5 +1,8 @@
+import time
+
 import pandas as pd
 
+from analytics.address import canonical_address
 from analytics.constants import CONTRACTS
 from analytics.ton_utils import extract_operation_type, body_is_jetton_transfer
 from analytics.base_utils import extract_amount_from_data
@@ -12,8 +15,10 @@ CONTRACTS_WITH_CUSTOM_VALUE = {
 }
 
 
-def transform_raw_base(raw_txs, contract_addr) -> pd.DataFrame:
+def transform_raw_base(raw_txs, contract_addr, run=None) -> pd.DataFrame:
+    """run — IngestRun: время разбора input (decode) учитывается отдельно."""
     rows = []
+    decode_seconds = 0.0
     contract_addr = contract_addr.lower()
 
     # если контракт требует кастомной обработки — достаём параметры
@@ -28,11 +33,13 @@ def transform_raw_base(raw_txs, contract_addr) -> pd.DataFrame:
 
             # если нужно — заменим на извлечённое из data
             if extract_cfg:
+                start = time.perf_counter()
                 raw_value = extract_amount_from_data(
                     tx["input"],
                     index=extract_cfg["index"],
                     decimals=extract_cfg["decimals"]
                 ) or 0.0
+                decode_seconds += time.perf_counter() - start
 
             rows.append(
                 {
@@ -45,19 +52,27 @@ def transform_raw_base(raw_txs, contract_addr) -> pd.DataFrame:
                     "network": "BASE",
                     "contract": contract_addr,
                     "type": tx["functionName"].split('(')[0],
+                    "wallet": canonical_address(tx["from"]),
                     "data": tx["input"]
                 }
             )
         except Exception:
             continue
 
+    if run is not None:
+        run.add("decode", decode_seconds)
     return pd.DataFrame(rows)
 
 
-def transform_raw_ton(raw_txs, contract_addr: str) -> pd.DataFrame:
+def transform_raw_ton(raw_txs, contract_addr: str, run=None) -> pd.DataFrame:
+    """run — IngestRun: время разбора BOC (decode) учитывается отдельно."""
     rows = []
+    decode_seconds = 0.0
     for tx in raw_txs:
         try:
+            start = time.perf_counter()
+            op_type = extract_operation_type(tx)
+            decode_seconds += time.perf_counter() - start
             rows.append(
                 {
                     "tx_hash": tx["transaction_id"]["hash"],
@@ -69,12 +84,15 @@ def transform_raw_ton(raw_txs, contract_addr: str) -> pd.DataFrame:
                     / 1e9,  # из нанотонов в TON (REAL)
                     "network": "TON",
                     "contract": contract_addr,
-                    "type": extract_operation_type(tx),
+                    "type": op_type,
+                    "wallet": canonical_address(tx["in_msg"]["source"]),
                     "data": tx["data"],
                 }
             )
         except Exception:
             continue
+    if run is not None:
+        run.add("decode", decode_seconds)
     return pd.DataFrame(rows)
 
 
@@ -0,0 +1,169 @@
+# analytics/writer.py
+import atexit
+import queue
+import threading
+from typing import Callable, Optional
+from config import DB_PATH
+
+from .db import connect
+
+
+class Ticket:
+    """Квитанция на запись: ждём commit'а группы, в которую попал батч."""
+
+    def __init__(
+        self,
+        fn: Optional[Callable],
+        transaction: bool = True,
+        on_commit: Optional[Callable] = None,
+    ):
+        self.fn = fn
+        self.transaction = transaction
+        self.on_commit = on_commit  # on_commit(result) в потоке писателя сразу после COMMIT
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self._done = threading.Event()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None):
+        if not self._done.wait(timeout):
+            raise TimeoutError("DB write was not committed in time")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class DbWriter:
+    """Единственный пишущий поток: разбирает очередь батчей и коммитит их группами."""
+
+    def __init__(self, path: str = DB_PATH, max_group: int = 64):
+        self.path = path
+        self.max_group = max_group
+        self._queue: "queue.Queue[Optional[Ticket]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="db-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(
+        self,
+        fn: Callable,
+        transaction: bool = True,
+        on_commit: Optional[Callable] = None,
+    ) -> Ticket:
+        """fn(con) выполняется в потоке писателя внутри общей транзакции.
+
+        transaction=False — вне транзакции (wal_checkpoint, VACUUM и т.п.).
+        """
+        self.start()
+        ticket = Ticket(fn, transaction, on_commit)
+        self._queue.put(ticket)
+        return ticket
+
+    def flush(self, timeout: Optional[float] = None):
+        # пустой маркер: очередь FIFO, значит всё поставленное раньше уже закоммичено
+        return self.submit(None).wait(timeout)
+
+    def stop(self, timeout: Optional[float] = 10):
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # ---------- writer thread ----------
+    def _run(self):
+        con = connect(self.path)
+        con.isolation_level = None  # транзакциями управляем сами
+        try:
+            while True:
+                first = self._queue.get()
+                if first is None:
+                    return
+                group = [first]
+                while len(group) < self.max_group:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        self._queue.put(None)
+                        break
+                    group.append(item)
+                self._process(con, group)
+        finally:
+            con.close()
+
+    def _process(self, con, group):
+        pending = []
+        for ticket in group:
+            if ticket.transaction:
+                pending.append(ticket)
+                continue
+            if pending:
+                self._commit_group(con, pending)
+                pending = []
+            self._run_single(con, ticket)
+        if pending:
+            self._commit_group(con, pending)
+
+    def _run_single(self, con, ticket):
+        try:
+            ticket.result = ticket.fn(con)
+        except Exception as e:
+            ticket.error = e
+        finally:
+            ticket._done.set()
+
+    def _commit_group(self, con, group):
+        try:
+            con.execute("BEGIN IMMEDIATE")
+            for ticket in group:
+                if ticket.fn is None:
+                    continue
+                # savepoint на батч: ошибка одного не откатывает соседей
+                con.execute("SAVEPOINT batch")
+                try:
+                    ticket.result = ticket.fn(con)
+                    con.execute("RELEASE batch")
+                except Exception as e:
+                    con.execute("ROLLBACK TO batch")
+                    con.execute("RELEASE batch")
+                    ticket.error = e
+            con.execute("COMMIT")
+            for ticket in group:
+                if ticket.on_commit is not None and ticket.error is None:
+                    try:
+                        ticket.on_commit(ticket.result)
+                    except Exception as e:
+                        print(f"[DB writer] on_commit failed: {e}")
+        except Exception as e:
+            if con.in_transaction:
+                con.execute("ROLLBACK")
+            print(f"[DB writer] group commit failed: {e}")
+            for ticket in group:
+                ticket.error = ticket.error or e
+        finally:
+            for ticket in group:
+                ticket._done.set()
+
+
+writer = DbWriter()
+atexit.register(writer.stop)
+
+
+def submit(
+    fn: Callable, transaction: bool = True, on_commit: Optional[Callable] = None
+) -> Ticket:
+    return writer.submit(fn, transaction, on_commit)
+
+
+def flush(timeout: Optional[float] = None):
+    writer.flush(timeout)
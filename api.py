@@ -0,0 +1,173 @@
+# api.py
+# Лёгкий JSON API для внутренних сервисов — вместо парсинга страниц Streamlit.
+#
+#   python api.py [--host 127.0.0.1] [--port 8502]
+#
+#   GET /metrics?network=BASE&contract=0x…&type=reward[&wallet=…]
+#   GET /time_series?network=BASE&contract=0x…&type=reward&period=daily
+#   GET /wallets?address=…&address=…[&contract=…&type=…]
+#   GET /version
+#
+# Данные — из кэша результатов (в т.ч. дискового, общего с дашбордом);
+# готовое тело ответа хранится до смены версии данных, повторный запрос с
+# If-None-Match получает 304 без обращения к аналитике.
+import argparse
+import hashlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict
+from urllib.parse import parse_qs, urlsplit
+
+from analytics import serialize
+from analytics.cache import ResultCache
+from analytics.metrics import cache_stats, get_metrics, get_time_series, get_wallet_rewards_many
+from analytics.storage import get_data_version, init_db
+from config import API_HOST, API_MAX_WALLETS, API_PORT, API_RESPONSE_CACHE_ENTRIES
+from ui.page_specs import ALL_CHAINS_REWARDS
+
+# по умолчанию кошельки ищутся по наградам обеих сетей, как на странице 6
+REWARD_CONTRACTS = ALL_CHAINS_REWARDS["wallet_lookup"]["contracts"]
+REWARD_TYPES = ALL_CHAINS_REWARDS["wallet_lookup"]["types"]
+
+# готовые ответы: (тело, ETag) по (путь, параметры) и версии данных
+response_cache = ResultCache(max_entries=API_RESPONSE_CACHE_ENTRIES, stale_while_revalidate=False)
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _one(params: dict, name: str):
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+def _metrics(params: dict) -> dict:
+    network, contract = _one(params, "network"), _one(params, "contract")
+    type_, wallet = _one(params, "type"), _one(params, "wallet")
+    return {
+        "network": network,
+        "contract": contract,
+        "type": type_,
+        "wallet": wallet,
+        "metrics": get_metrics(network, contract, type_, wallet),
+    }
+
+
+def _time_series(params: dict) -> dict:
+    network, contract, type_ = _one(params, "network"), _one(params, "contract"), _one(params, "type")
+    period = _one(params, "period") or "daily"
+    try:
+        df = get_time_series(network, contract, type_, period)
+    except ValueError as e:
+        raise BadRequest(str(e)) from None
+    return {
+        "network": network,
+        "contract": contract,
+        "type": type_,
+        "period": period,
+        "series": serialize.records(df),
+    }
+
+
+def _wallets(params: dict) -> dict:
+    wallets = params.get("address") or []
+    if not wallets:
+        raise BadRequest("missing parameter: address")
+    if len(wallets) > API_MAX_WALLETS:
+        raise BadRequest(f"too many addresses: {len(wallets)} > {API_MAX_WALLETS}")
+    contracts = params.get("contract") or REWARD_CONTRACTS
+    types = params.get("type") or REWARD_TYPES
+    df = get_wallet_rewards_many(wallets, contracts, types)
+    return {"contracts": contracts, "types": types, "wallets": serialize.records(df)}
+
+
+def _version() -> dict:
+    return {"data_version": get_data_version(), "cache": cache_stats(), "responses": response_cache.stats()}
+
+
+ROUTES: Dict[str, Callable[[dict], dict]] = {
+    "/metrics": _metrics,
+    "/time_series": _time_series,
+    "/wallets": _wallets,
+}
+
+
+def respond(path: str, query: str):
+    """(статус, тело, ETag) для GET path?query; тело берётся из response_cache."""
+    if path == "/version":
+        return HTTPStatus.OK, serialize.dumps(_version()).encode(), None
+    handler = ROUTES.get(path)
+    if handler is None:
+        return HTTPStatus.NOT_FOUND, serialize.dumps({"error": f"unknown path: {path}"}).encode(), None
+
+    params = parse_qs(query)
+    key = (path, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+    version = get_data_version()
+    cached = response_cache.get(key, version)
+    if cached is not None:
+        return (HTTPStatus.OK, *cached)
+
+    try:
+        body = serialize.dumps({"data_version": version, **handler(params)}).encode()
+    except BadRequest as e:
+        return HTTPStatus.BAD_REQUEST, serialize.dumps({"error": str(e)}).encode(), None
+    etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+    response_cache.put(key, version, (body, etag))
+    return HTTPStatus.OK, body, etag
+
+
+class Handler(BaseHTTPRequestHandler):
+    # keep-alive: без нового TCP-соединения на каждый запрос; TCP_NODELAY —
+    # заголовки и тело уходят разными write, Nagle + delayed ACK дали бы ~40 мс
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            status, body, etag = respond(url.path.rstrip("/") or "/", url.query)
+        except Exception as e:
+            print(f"[API] Error handling {self.path}: {e}")
+            status, body, etag = HTTPStatus.INTERNAL_SERVER_ERROR, serialize.dumps({"error": str(e)}).encode(), None
+
+        if etag is not None and etag in self.headers.get("If-None-Match", ""):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # журнал на каждый запрос дороже самого ответа из кэша
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args()
+
+    init_db()
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"[API] Listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/bench_api.py
+"""
+Задержка JSON API (api.py): первый запрос, повторный 200 из готового ответа
+и 304 по If-None-Match — через одно keep-alive соединение.
+
+    python -m benchmarks.bench_api [-n 2000]
+"""
+import argparse
+import http.client
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+PATHS = [
+    "/metrics?network=BASE&contract=0xa69a396c45bd525f8516a43242580c4e88bba401&type=mintGem",
+    "/time_series?network=TON&contract=EQCfcwvBP2cnD8UwWLKtX1pcAqEDFwFyXzuZ0seyPBdocPHu&type=0x76ebc41e&period=all",
+    "/wallets?address=0x91430ec444fd8249e152adf82a73f985b031276e",
+]
+
+
+def _get(conn, path, headers=None):
+    conn.request("GET", path, headers=headers or {})
+    resp = conn.getresponse()
+    resp.read()
+    return resp
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=2000)
+    args = parser.parse_args()
+
+    import api
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), api.Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+
+    for path in PATHS:
+        start = time.perf_counter()
+        etag = _get(conn, path).getheader("ETag")
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.n):
+            _get(conn, path)
+        warm = (time.perf_counter() - start) / args.n
+
+        start = time.perf_counter()
+        for _ in range(args.n):
+            status = _get(conn, path, {"If-None-Match": etag}).status
+        revalidate = (time.perf_counter() - start) / args.n
+
+        print(
+            f"{path.split('?')[0]:<14} cold {cold * 1e3:8.2f} ms   "
+            f"200 {warm * 1e3:6.3f} ms   {status} {revalidate * 1e3:6.3f} ms"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
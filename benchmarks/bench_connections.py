@@ -0,0 +1,52 @@
+# benchmarks/bench_connections.py
+"""
+Накладные расходы на соединение: старый `_conn()` (connect + PRAGMA WAL +
+commit + close на каждый вызов) против пула соединений analytics.db.
+
+    python -m benchmarks.bench_connections [--db data/tx.sqlite] [-n 2000]
+"""
+import argparse
+import sqlite3
+import time
+from contextlib import contextmanager
+
+QUERY = "SELECT COUNT(*) FROM transactions WHERE network = ? AND contract = ?"
+PARAMS = ("BASE", "0xa69a396c45bd525f8516a43242580c4e88bba401")
+
+
+@contextmanager
+def _legacy_conn(path):
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode=WAL")
+    try:
+        yield con
+    finally:
+        con.commit()
+        con.close()
+
+
+def _run(label, n, make_ctx):
+    start = time.perf_counter()
+    for _ in range(n):
+        with make_ctx() as c:
+            c.execute(QUERY, PARAMS).fetchone()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {n} queries: {elapsed * 1000:8.1f} ms  ({elapsed / n * 1e6:7.1f} µs/query)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default="data/tx.sqlite")
+    parser.add_argument("-n", type=int, default=2000)
+    args = parser.parse_args()
+
+    from analytics.db import read_conn
+
+    legacy = _run("legacy", args.n, lambda: _legacy_conn(args.db))
+    pooled = _run("pooled", args.n, lambda: read_conn(args.db))
+    print(f"speedup: x{legacy / pooled:.1f}")
+
+
+if __name__ == "__main__":
+    main()
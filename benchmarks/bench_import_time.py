@@ -0,0 +1,83 @@
+# benchmarks/bench_import_time.py
+"""
+Время импорта точек входа по `python -X importtime`: каждый модуль — в
+отдельном процессе с пустым sys.modules, берётся медиана прогонов.
+
+    python -m benchmarks.bench_import_time [--runs 3] [--top 8] [--scale 1.0]
+
+Код возврата 1, если модуль вышел за бюджет (BUDGETS_MS * scale), потянул за
+собой модуль из DEFERRED или что-то напечатал при импорте (побочный эффект
+вроде init_db()).
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# мс на машине разработчика с запасом ~1.5x; на медленных — --scale
+BUDGETS_MS = {
+    "analytics.storage": 600,
+    "analytics.metrics": 600,
+    "api": 750,
+    "ui.display": 1400,
+    "ui.contract_page": 1400,
+    "scheduler": 1400,
+}
+
+# импортируются при первом использовании, а не на старте страницы/процесса
+DEFERRED = ["plotly.express", "apscheduler", "httpx", "requests", "tonsdk"]
+
+
+def _importtime(module: str):
+    """(cumulative мкс, {модуль: self мкс}, stdout) одного холодного импорта."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total, own = 0, {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        own[name] = int(self_us)
+        if name == module:
+            total = int(cumulative_us)
+    return total, own, proc.stdout
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in BUDGETS_MS.items():
+        runs = [_importtime(module) for _ in range(args.runs)]
+        total_ms = statistics.median(r[0] for r in runs) / 1000
+        own, stdout = runs[-1][1], runs[-1][2]
+        limit = budget * args.scale
+
+        problems = []
+        if total_ms > limit:
+            problems.append(f"over budget {limit:.0f} ms")
+        eager = sorted({d for d in DEFERRED for name in own if name == d or name.startswith(d + ".")})
+        if eager:
+            problems.append(f"eager imports: {', '.join(eager)}")
+        if stdout.strip():
+            problems.append(f"prints on import: {stdout.strip().splitlines()[0]!r}")
+        failed |= bool(problems)
+
+        print(f"{module:<20} {total_ms:8.1f} ms  (budget {limit:.0f})  {'FAIL: ' + '; '.join(problems) if problems else 'ok'}")
+        for name, us in sorted(own.items(), key=lambda kv: -kv[1])[: args.top]:
+            print(f"    {us / 1000:7.1f} ms  {name}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
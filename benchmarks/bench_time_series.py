@@ -0,0 +1,106 @@
+# benchmarks/bench_time_series.py
+"""
+get_time_series: бакеты в SQLite (engine="sql") против pandas (engine="pandas")
+на синтетической истории заданного размера. Замеряется сам расчёт
+(get_time_series.uncached) — кэш результатов в памяти и на диске обходится.
+
+    python -m benchmarks.bench_time_series [--sizes 100000,1000000,10000000] [--dir /tmp]
+
+Базы генерируются один раз и переиспользуются при повторном запуске.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+NETWORK, CONTRACT, TYPE = "BASE", "0xbench", "mintGem"
+PERIODS = ["daily", "weekly", "monthly", "all"]
+HISTORY_DAYS = 365
+
+
+def _use_db(path: str):
+    # analytics читает DB_PATH при импорте — переимпортируем под каждую базу
+    import config
+
+    config.DB_PATH = path
+    for name in [m for m in sys.modules if m.startswith("analytics")]:
+        del sys.modules[name]
+    from analytics import storage
+
+    storage.init_db()
+
+
+def _generate(path: str, rows: int):
+    con = sqlite3.connect(path)
+    now = int(time.time())
+    rnd = random.Random(rows)
+    wallets = [f"0x{i:040x}" for i in range(max(rows // 20, 1))]
+
+    def batch(start, stop):
+        for i in range(start, stop):
+            wallet = rnd.choice(wallets)
+            yield (
+                f"0x{i:064x}",
+                now - rnd.randrange(HISTORY_DAYS * 86400),
+                i,
+                wallet,
+                CONTRACT,
+                rnd.random(),
+                NETWORK,
+                CONTRACT,
+                TYPE,
+                wallet,
+            )
+
+    step = 200_000
+    for start in range(0, rows, step):
+        con.executemany(
+            'INSERT INTO transactions (tx_hash, timestamp, block, "from", "to", value, network, contract, type, wallet) '
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            batch(start, min(start + step, rows)),
+        )
+        con.commit()
+    con.execute("ANALYZE")
+    con.commit()
+    con.close()
+
+
+def _bench(rows: int):
+    from analytics.metrics import get_time_series
+
+    print(f"\n{rows:,} rows")
+    for period in PERIODS:
+        timings = {}
+        for engine in ("sql", "pandas"):
+            start = time.perf_counter()
+            df = get_time_series.uncached(NETWORK, CONTRACT, TYPE, period, engine=engine)
+            timings[engine] = time.perf_counter() - start
+        print(
+            f"  {period:<8} sql {timings['sql'] * 1000:9.1f} ms   "
+            f"pandas {timings['pandas'] * 1000:9.1f} ms   "
+            f"x{timings['pandas'] / timings['sql']:.1f}  ({len(df)} buckets)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100000,1000000,10000000")
+    parser.add_argument("--dir", default="data/bench")
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    for rows in (int(s) for s in args.sizes.split(",")):
+        path = os.path.join(args.dir, f"time_series_{rows}.sqlite")
+        fresh = not os.path.exists(path)
+        _use_db(path)
+        if fresh:
+            started = time.perf_counter()
+            _generate(path, rows)
+            print(f"generated {path} in {time.perf_counter() - started:.1f}s")
+        _bench(rows)
+
+
+if __name__ == "__main__":
+    main()
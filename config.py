@@ -1 +1,50 @@
-DB_PATH = "data/tx.sqlite"
\ No newline at end of file
+DB_PATH = "data/tx.sqlite"
+
+# читатели дашборда могут работать с копией БД, которую обновляет планировщик
+SNAPSHOT_PATH = "data/tx.snapshot.sqlite"
+READ_FROM_SNAPSHOT = False
+WAL_CHECKPOINT_MINUTES = 5
+
+# обслуживание БД: ANALYZE / incremental_vacuum / wal_checkpoint(TRUNCATE)
+MAINTENANCE_HOURS = 24
+MAINTENANCE_QUIET_MIN_HOURS = 6
+
+# живые счётчики для get_metrics в процессе, где работает планировщик
+LIVE_METRICS = True
+
+# общий кэш результатов аналитики (analytics.cache)
+CACHE_MAX_ENTRIES = 512
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_MAX_AGE = 30  # сек: окна day/week/month сдвигаются и без новых данных
+CACHE_STALE_WHILE_REVALIDATE = True  # отдавать устаревшее сразу, пересчитывать в фоне
+CACHE_REFRESH_WORKERS = 2
+# второй уровень кэша на диске — общий для процессов
+CACHE_DISK = True
+RESULT_CACHE_PATH = "data/cache.sqlite"
+
+# графики: не больше стольких точек/столбцов (длинные ряды укрупняются или прореживаются)
+CHART_MAX_POINTS = 400
+FIGURE_CACHE_ENTRIES = 256  # готовые фигуры, общие для всех сессий
+
+# вкладки периодов на страницах контрактов: считать только выбранную
+LAZY_TABS = True
+
+# карточки метрик: фрагмент проверяет версию данных раз в N секунд (None — выключено)
+CARDS_REFRESH_SECONDS = 15
+CARDS_MAX_AGE = 300  # сек: без новых данных карточки всё равно пересчитываются
+
+# статический снимок всех страниц (HTML/JSON) для публичного трафика — ui.static_export
+STATIC_EXPORT = True
+STATIC_EXPORT_DIR = "data/static"
+STATIC_EXPORT_MAX_AGE = 600  # сек: без новых данных снимок всё равно обновляется (окна сдвигаются)
+
+# JSON API для внутренних сервисов — api.py
+API_HOST = "127.0.0.1"
+API_PORT = 8502
+API_RESPONSE_CACHE_ENTRIES = 1024  # готовые тела ответов до смены версии данных
+API_MAX_WALLETS = 1000  # адресов в одном запросе /wallets
+
+# журнал загрузки по контрактам (analytics.ingest_stats) и страница Ingestion Health
+INGEST_STATS_RETENTION_DAYS = 7
+INGEST_STALE_MINUTES = 10  # без успешного прохода дольше — контракт «stale»
+INGEST_BEHIND_SECONDS = 300  # новейшая tx у источника новее сохранённой больше чем на — «behind»
@@ -2,165 +2,75 @@
 
 import streamlit as st
 import pandas as pd
-from analytics.metrics import get_metrics, get_time_series, get_wallet_rewards
+from functools import partial
+from analytics.storage import init_db
+from analytics.metrics import (
+    get_metrics_many,
+    get_time_series_many,
+    get_wallet_rewards,
+    get_wallet_rewards_many,
+)
+from ui.contract_page import CARD_FORMATS
 from ui.display import inject_card_styles, metric_card, draw_chart, fill_missing_dates
+from ui.page_specs import ALL_CHAINS_REWARDS as PAGE
 
 # ─────────────────────────────────────────  Конфигурация
-PAGE_TITLE = "Total Rewards Withdrawn — All Chains"
-BASE_COLOR = "#3a6da3"
+PAGE_TITLE = PAGE["title"]
+BASE_COLOR = PAGE["color"]
 
 st.set_page_config(page_title=PAGE_TITLE, layout="wide")
 st.title(PAGE_TITLE)
+init_db()  # раз на процесс; страницу могут открыть по ссылке, минуя app.py
 
-NETWORKS = {
-    "BASE": {
-        "contract": "0x1f735280c83f13c6d40aa2ef213eb507cb4c1ec7",
-        "type": "reward",
-        "symbol": "USDC",
-    },
-    "TON": {
-        "contract": "EQCfcwvBP2cnD8UwWLKtX1pcAqEDFwFyXzuZ0seyPBdocPHu",
-        "type": "0x76ebc41e",
-        "symbol": "USDT",
-    },
-}
+NETWORKS = PAGE["networks"]
+LOOKUP = PAGE["wallet_lookup"]
 
 # ─────────────────────────────────────────  Стили
 inject_card_styles()
 
 
 # ─────────────────────────────────────────  Получение и агрегация метрик
-@st.cache_data(ttl=30)
-def _get_all_metrics():
-    totals = {
-        "tx_day": 0,
-        "tx_week": 0,
-        "tx_month": 0,
-        "total_tx_count": 0,
-        "total_volume": 0,
-        "unique_wallets": 0,
-    }
-
-    for net, data in NETWORKS.items():
-        m = get_metrics(net, data["contract"], data["type"])
-        totals["tx_day"] += m.get("tx_day", 0)
-        totals["tx_week"] += m.get("tx_week", 0)
-        totals["tx_month"] += m.get("tx_month", 0)
-        totals["total_tx_count"] += m.get("total_tx_count", 0)
-        totals["total_volume"] += m.get("total_volume", 0)
-        totals["unique_wallets"] += m.get("unique_wallets", 0)
-
-    return totals
-
-
-metrics = _get_all_metrics()
+SPECS = [(net, data["contract"], data["type"]) for net, data in NETWORKS.items()]
 
-# ─────────────────────────────────────────  Метрики
-st.markdown("### 💰 Total Rewards Withdrawn (All Chains)")
-cols = st.columns(4)
-metric_map = [
-    ("Withdraw / Day", "tx_day", "Total withdrawn in last 24h"),
-    ("Withdraw / Week", "tx_week", "Total withdrawn in last 7d"),
-    ("Withdraw / Month", "tx_month", "Total withdrawn in last 30d"),
-    ("Total Withdrawn", "total_tx_count", "All-time rewards withdrawn"),
-]
-for col, (label, key, tooltip) in zip(cols, metric_map):
-    col.markdown(
-        metric_card(label, f"{metrics[key]:,.0f}", tooltip), unsafe_allow_html=True
-    )
-
-# ─────────────────────────────────────────  Сводка
-st.markdown("---")
-st.markdown("### 👥 & 💰 Summary")
 
-col1, col2 = st.columns(2)
+def _get_all_metrics():
+    # одним запросом; уникальные кошельки — по объединению сетей
+    return get_metrics_many(SPECS)["combined"]
 
-col1.markdown(
-    metric_card(
-        "Unique Wallets",
-        f"{metrics['unique_wallets']:,}",
-        "Total unique reward recipients across chains",
-    ),
-    unsafe_allow_html=True,
-)
 
-col2.markdown(
-    metric_card(
-        "Total Withdrawn Volume",
-        f"${metrics['total_volume']:,.2f}",
-        "Sum of all rewards withdrawn (USDC + USDT)",
-    ),
-    unsafe_allow_html=True,
-)
+metrics = _get_all_metrics()
 
-st.markdown("---")
+# ─────────────────────────────────────────  Метрики и сводка
+for heading, cards in PAGE["cards"]:
+    st.markdown(heading)
+    for col, (label, key, fmt, tooltip) in zip(st.columns(len(cards)), cards):
+        col.markdown(metric_card(label, CARD_FORMATS[fmt].format(metrics[key]), tooltip), unsafe_allow_html=True)
+    st.markdown("---")
 
 
 # ─────────────────────────────────────────  Графики по периодам
-@st.cache_data(ttl=30)
-def _get_combined_series(period: str) -> pd.DataFrame:
-    dfs = []
-    for net, data in NETWORKS.items():
-        df = get_time_series(net, data["contract"], data["type"], period)
-        # ❌ df["tx_count"] = 1  — это удаляем
-
-        # Переименовываем tx_count и amount, чтобы сохранить сетевые данные отдельно
-        df = df[["period", "amount", "tx_count"]].rename(
-            columns={"amount": f"amount_{net}", "tx_count": f"tx_count_{net}"}
-        )
-        dfs.append(df.set_index("period"))
-
-    if not dfs:
-        return pd.DataFrame()
-
-    df_all = pd.concat(dfs, axis=1).fillna(0)
+def _get_all_series() -> dict:
+    # все периоды обеих сетей — один запрос
+    return get_time_series_many(SPECS)
 
-    # Суммируем по всем сетям
-    df_all["amount"] = df_all[
-        [col for col in df_all.columns if col.startswith("amount_")]
-    ].sum(axis=1)
-    df_all["tx_count"] = df_all[
-        [col for col in df_all.columns if col.startswith("tx_count_")]
-    ].sum(axis=1)
 
-    df_all = df_all.reset_index()
-    return fill_missing_dates(df_all, period)
-
-
-tab_day, tab_week, tab_month, tab_all = st.tabs(
-    ["📅 Daily", "📅 Weekly", "📅 Monthly", "📅 All Time"]
-)
-
-with tab_day:
-    df = _get_combined_series("daily")
-    draw_chart(df, "💸 Total Withdrawals by Day", BASE_COLOR, x_format="%H:%M")
-
-with tab_week:
-    df = _get_combined_series("weekly")
-    draw_chart(df, "📅 Total Withdrawals by Week", BASE_COLOR, x_format="%b %d")
+def _get_combined_series(period: str) -> pd.DataFrame:
+    df = _get_all_series()[period]["combined"]
+    return fill_missing_dates(df.copy(), period)
 
-with tab_month:
-    df = _get_combined_series("monthly")
-    draw_chart(df, "📅 Total Withdrawals by Month", BASE_COLOR, x_format="%b %d")
 
-with tab_all:
-    df = _get_combined_series("all")
-    draw_chart(df, "📅 Total Withdrawals — All Time", BASE_COLOR, x_format="%b %d")
+charts = PAGE["charts"]
+for tab, (_, period, title, x_format) in zip(st.tabs([c[0] for c in charts]), charts):
+    with tab:
+        draw_chart(partial(_get_combined_series, period), title, BASE_COLOR, x_format=x_format, cache_key=("withdrawals_all_chains", period))
 
 st.markdown("---")
 
 # ─────────────────────────────────────────  Поиск по кошельку
-st.markdown("### 🔍 Wallet Lookup: Total Rewards Withdrawn")
-wallet_input = st.text_input("Enter your wallet address", placeholder="0xabc...")
-
-CONTRACTS = [
-    "0x1f735280c83f13c6d40aa2ef213eb507cb4c1ec7",
-    "EQCfcwvBP2cnD8UwWLKtX1pcAqEDFwFyXzuZ0seyPBdocPHu",
-]
-TYPES = [
-    "reward",
-    "0x76ebc41e",
-]
+st.markdown(LOOKUP["title"])
+wallet_input = st.text_input("Enter your wallet address", placeholder=LOOKUP["placeholder"]).strip()
+
+CONTRACTS, TYPES = LOOKUP["contracts"], LOOKUP["types"]
 
 if wallet_input:
     try:
@@ -184,3 +94,24 @@ if wallet_input:
 
     except Exception as e:
         st.error(f"Ошибка при получении данных: {e}")
+
+# ─────────────────────────────────────────  Пакетный поиск (CSV)
+uploaded = st.file_uploader("Or upload a CSV with wallet addresses (first column)", type="csv")
+
+if uploaded is not None:
+    try:
+        wallets = pd.read_csv(uploaded, header=None, dtype=str).iloc[:, 0].dropna().tolist()
+        result = get_wallet_rewards_many(wallets, CONTRACTS, TYPES)
+        result["total_value"] = result["total_value"].round(4)
+
+        st.subheader(f"📊 {len(result):,} wallets, {int((result['tx_count'] > 0).sum()):,} with withdrawals")
+        st.dataframe(result, hide_index=True, width="stretch")
+        st.download_button(
+            "Download CSV",
+            result.to_csv(index=False),
+            file_name="wallet_rewards.csv",
+            mime="text/csv",
+        )
+
+    except Exception as e:
+        st.error(f"Ошибка при получении данных: {e}")
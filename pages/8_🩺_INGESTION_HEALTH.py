@@ -0,0 +1,78 @@
+# pages/8_🩺_INGESTION_HEALTH.py
+
+import streamlit as st
+from analytics.storage import init_db
+from analytics.ingest_stats import STAGES, ingest_health
+from config import CARDS_REFRESH_SECONDS, INGEST_BEHIND_SECONDS, INGEST_STALE_MINUTES
+from ui.display import inject_card_styles, metric_card
+
+# ───────────────────────────────────────── Конфигурация
+PAGE_TITLE = "Ingestion Health"
+WINDOWS = {"1h": 1, "6h": 6, "24h": 24, "7d": 24 * 7}
+
+st.set_page_config(page_title=PAGE_TITLE, layout="wide")
+st.title(PAGE_TITLE)
+init_db()  # раз на процесс; страницу могут открыть по ссылке, минуя app.py
+
+inject_card_styles()
+
+window = st.segmented_control("Window", list(WINDOWS), default="24h", label_visibility="collapsed") or "24h"
+
+STATUS_ORDER = {"error": 0, "stale": 1, "behind": 2, "throttled": 3, "ok": 4}
+STAGE_COLUMNS = [f"{stage}_ms" for stage in STAGES]
+
+
+@st.fragment(run_every=CARDS_REFRESH_SECONDS)
+def render_health():
+    health = ingest_health(hours=WINDOWS[window])
+    latest, runs = health["latest"], health["runs"]
+    if latest.empty:
+        st.info("No ingestion runs recorded yet — they appear after the first scheduler cycle.")
+        return
+
+    # ───────────────────────────────────────── Сводка
+    st.markdown("### 🩺 Status")
+    problems = latest[latest["status"].isin(["stale", "error", "behind"])]
+    slowest = latest.loc[latest["total_ms"].idxmax()]
+    cards = [
+        ("Contracts OK", f"{int((latest['status'] == 'ok').sum())} / {len(latest)}", "Last run succeeded, no 429, nothing missed"),
+        ("Stale / Error / Behind", f"{len(problems)}", f"No successful run for {INGEST_STALE_MINUTES} min, last run failed, or the source has transactions over {INGEST_BEHIND_SECONDS}s newer"),
+        ("HTTP 429", f"{int(runs['http_429'].sum()):,}", f"Rate-limited responses in the last {window}"),
+        ("Slowest Contract", f"{slowest['name']} · {slowest['total_ms'] / 1000:,.1f}s", "Total duration of the last run"),
+    ]
+    for col, (label, value, tooltip) in zip(st.columns(len(cards)), cards):
+        col.markdown(metric_card(label, value, tooltip), unsafe_allow_html=True)
+
+    # ───────────────────────────────────────── Последний проход по контрактам
+    st.markdown("### 📋 Latest run per contract")
+    table = latest.sort_values("status", key=lambda s: s.map(STATUS_ORDER)).assign(
+        ok_age_min=lambda df: (df["ok_age_s"] / 60).round(1),
+        data_age_h=lambda df: (df["data_age_s"] / 3600).round(1),
+    )
+    st.dataframe(
+        table[
+            ["status", "network", "name", "started_at", "ok_age_min", "data_age_h", "behind_s",
+             *STAGE_COLUMNS, "total_ms", "requests", "http_429",
+             "rows_fetched", "rows_inserted", "rows_ignored", "error"]
+        ],
+        hide_index=True,
+        width="stretch",
+    )
+    st.caption(
+        "ok_age_min — minutes since the last successful run; data_age_h — age of the newest stored "
+        "transaction; behind_s — how much newer the source's latest transaction (probed before the fetch) "
+        f"is than the newest stored one; over {INGEST_BEHIND_SECONDS}s the contract is marked behind."
+    )
+
+    # ───────────────────────────────────────── Стадии и динамика
+    st.markdown("### ⏱️ Stage durations, last run (ms)")
+    st.bar_chart(latest.set_index("name")[STAGE_COLUMNS])
+
+    st.markdown(f"### 📈 Total run duration, last {window} (ms)")
+    st.line_chart(runs.pivot_table(index="started_at", columns="name", values="total_ms"))
+
+    st.markdown(f"### 🚦 Requests and 429, last {window}")
+    st.line_chart(runs.set_index("started_at").resample("10min")[["requests", "http_429"]].sum())
+
+
+render_health()
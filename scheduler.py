@@ -1,54 +1,122 @@
-import sys
 import streamlit as st
-from apscheduler.schedulers.background import BackgroundScheduler
-from analytics.fetch import fetch_base_transactions, fetch_ton_transactions
-from analytics.storage import upsert_tx
+from analytics.fetch import fetch_base_last_tx, fetch_base_transactions, fetch_ton_last_tx, fetch_ton_transactions
+from analytics.ingest_stats import IngestRun
+from analytics.storage import init_db, upsert_tx, checkpoint_wal, publish_snapshot
 from analytics.transform import transform_raw_base, transform_raw_ton
 
 
 from analytics.constants import *
+from analytics.maintenance import run_maintenance, maybe_run_maintenance
+from analytics import live
+from config import WAL_CHECKPOINT_MINUTES, MAINTENANCE_HOURS, LIVE_METRICS, STATIC_EXPORT
+
+
+def _ingest(run: IngestRun, probe, fetch, transform) -> IngestRun:
+    """probe(run) -> (блок, время) новейшей tx у источника, fetch(run) -> сырые tx,
+    transform(txs, run) -> df; замеры пишутся в ingest_runs."""
+    try:
+        with run.stage("fetch"):
+            # голова — до загрузки: всё, что источник уже отдал бы, батч обязан покрыть
+            head = probe(run)
+            if head is not None:
+                run.head_block, run.head_ts = head
+            txs = fetch(run)
+        run.rows_fetched = len(txs)
+        with run.stage("transform"):
+            df = transform(txs, run)
+        with run.stage("upsert"):
+            inserted = upsert_tx(df)
+        run.rows_inserted, run.rows_ignored = inserted, len(df) - inserted
+        print(f"[{run.network}] Updated {run.name}: {len(df)} tx, {inserted} new ({run.summary()})")
+    except Exception as e:
+        run.error = str(e)
+        print(f"[{run.network}] Error updating {run.name}: {e}")
+    run.save()
+    return run
+
+
+def _finish_cycle(runs: list):
+    publish_snapshot()
+    export_static()
+    # обслуживание — в простое: ничего нового и ни одного упавшего прохода
+    # (после ошибки rows_inserted тоже 0, но цикл не был пустым)
+    if all(run.error is None and run.rows_inserted == 0 for run in runs):
+        maybe_run_maintenance()
 
 
 def update_base_data():
     print(f"[BASE] update_base_data")
+    runs = []
     for name, data in CONTRACTS["base"].items():
+        addr = data.get("address", None)
+        if not addr:
+            continue
+        run = IngestRun("BASE", name, addr.lower())
+        runs.append(run)
         try:
-            addr = data.get("address", None)
             apikey = st.secrets['etherscan']['key']
-            if not addr:
-                continue
-            txs = fetch_base_transactions(chainid=BASE_CHAIN_ID, address=addr, apikey=apikey)
-            df = transform_raw_base(txs, addr)  # addr передай, если нужно фильтровать
-            print("TRANSFORM", len(df), df.head(1))
-            upsert_tx(df)
-
-            print(f"[BASE] Updated {name}: {len(df)} tx")
         except Exception as e:
+            run.error = f"etherscan key: {e}"
             print(f"[BASE] Error updating {name}: {e}")
+            run.save()
+            continue
+        _ingest(
+            run,
+            lambda run: fetch_base_last_tx(BASE_CHAIN_ID, addr, apikey, run=run),
+            lambda run: fetch_base_transactions(chainid=BASE_CHAIN_ID, address=addr, apikey=apikey, run=run),
+            lambda txs, run: transform_raw_base(txs, addr, run=run),
+        )
+    _finish_cycle(runs)
 
 
 def update_ton_data():
     print(f"[TON] update_ton_data")
+    runs = []
     for name, data in CONTRACTS["ton"].items():
-        try:
-            addr = data.get("address", None)
-            if not addr:
-                continue
-            txs = fetch_ton_transactions(addr)
-            df = transform_raw_ton(txs, addr)
-            print("TRANSFORM", len(df), df.head(1), file=sys.stderr)
-            upsert_tx(df)
-
-            print(f"[TON] Updated {name}: {len(df)} tx")
-        except Exception as e:
-            print(f"[TON] Error updating {name}: {e}")
+        addr = data.get("address", None)
+        if not addr:
+            continue
+        runs.append(_ingest(
+            IngestRun("TON", name, addr),
+            lambda run: fetch_ton_last_tx(addr, run=run),
+            lambda run: fetch_ton_transactions(addr, run=run),
+            lambda txs, run: transform_raw_ton(txs, addr, run=run),
+        ))
+    _finish_cycle(runs)
+
+
+def export_static():
+    # статический снимок для публичного трафика — только если данные изменились
+    if not STATIC_EXPORT:
+        return
+    try:
+        from ui.static_export import maybe_export_snapshot
+
+        pages = maybe_export_snapshot()
+        if pages:
+            print(f"[EXPORT] Static snapshot: {len(pages)} pages")
+    except Exception as e:
+        print(f"[EXPORT] Error exporting static snapshot: {e}")
+
+
+def checkpoint_db():
+    busy, wal_pages, done = checkpoint_wal("PASSIVE")
+    print(f"[DB] WAL checkpoint: {done}/{wal_pages} pages, busy={busy}")
 
 
 def start():
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+    init_db()
+    if LIVE_METRICS:
+        live.enable()
+
     scheduler = BackgroundScheduler()
 
     scheduler.add_job(update_base_data, "interval", minutes=1)
     scheduler.add_job(update_ton_data, "interval", minutes=1)
+    scheduler.add_job(checkpoint_db, "interval", minutes=WAL_CHECKPOINT_MINUTES)
+    scheduler.add_job(run_maintenance, "interval", hours=MAINTENANCE_HOURS)
 
     # выполняем первую синхронную итерацию
     update_base_data()
@@ -1,18 +1,15 @@
 # transform.py
-import sqlite3
 import pandas as pd
 from datetime import datetime, timedelta
 import base64, struct
 from tonsdk.boc import Cell
 
 from config import CONTRACTS
-
-
-DB_PATH = "data/tx.sqlite"
+from analytics.db import read_conn
 
 
 def _load_data(network: str, contract: str, type_: str) -> pd.DataFrame:
-    with sqlite3.connect(DB_PATH) as conn:
+    with read_conn() as conn:
         query = """
         SELECT 
             timestamp, 
@@ -0,0 +1,95 @@
+# ui/contract_page.py
+# Единый рендерер страниц контрактов по описаниям из ui.page_specs.
+import pandas as pd
+import streamlit as st
+
+from analytics.metrics import get_metrics, get_page_data, get_time_series, get_wallet_rewards
+from analytics.storage import get_data_version, init_db
+from config import LAZY_TABS
+from ui.display import inject_card_styles, live_cards, metric_card, selected_period, tabs_with_series
+from ui.page_specs import PAGE_SPECS
+
+CARD_FORMATS = {
+    "count": "{:,}",
+    "usd": "${:,.2f}",
+}
+
+
+def render_contract_page(name: str):
+    spec = PAGE_SPECS[name]
+    series_spec = (spec["network"], spec["contract"], spec["type"])
+    charts = spec["charts"]
+    tabs_key = f"period_{name}"
+
+    st.set_page_config(page_title=spec["title"], layout="wide")
+    st.title(spec["title"])
+    init_db()  # раз на процесс; страницу могут открыть по ссылке, минуя app.py
+    st.markdown(f"CONTRACT: `{spec['contract']}`")
+
+    inject_card_styles()
+
+    # карточки и видимые графики — одним обращением к аналитике
+    periods = [selected_period(charts, tabs_key)] if LAZY_TABS else [c[1] for c in charts]
+    version = get_data_version()
+    data = get_page_data([series_spec], periods)
+
+    def _render_cards(m: dict):
+        for heading, cards in spec["cards"]:
+            st.markdown(heading)
+            for col, (label, key, fmt, tooltip) in zip(st.columns(len(cards)), cards):
+                col.markdown(metric_card(label, CARD_FORMATS[fmt].format(m[key]), tooltip), unsafe_allow_html=True)
+
+    # дальше карточки обновляются сами, когда меняется версия данных
+    live_cards(
+        name,
+        load=lambda: get_metrics(*series_spec),
+        render=_render_cards,
+        initial=(version, data["metrics"][series_spec]),
+    )
+
+    st.markdown("---")
+
+    def _series(period: str) -> pd.DataFrame:
+        if period in data["series"]:
+            return data["series"][period][series_spec]
+        return get_time_series(*series_spec, period)
+
+    tabs_with_series(
+        _series,
+        charts,
+        spec["color"],
+        prefetch=lambda period: get_time_series.prefetch(*series_spec, period),
+        key=tabs_key,
+        cache_key=series_spec,
+    )
+
+    if spec["wallet_lookup"]:
+        st.markdown("---")
+        render_wallet_lookup(spec["wallet_lookup"])
+
+
+def render_wallet_lookup(lookup: dict):
+    st.markdown(lookup["title"])
+    wallet_input = st.text_input("Введите адрес кошелька", placeholder=lookup["placeholder"]).strip()
+    if not wallet_input:
+        return
+
+    try:
+        summary = get_wallet_rewards(wallet_input, lookup["contracts"], lookup["types"])
+
+        # Форматирование даты
+        last_tx_str = summary["last_tx"]
+        if last_tx_str:
+            last_tx_str = pd.to_datetime(last_tx_str).strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            last_tx_str = "Нет транзакций"
+
+        st.subheader("📊 Статистика по кошельку")
+        st.table({
+            "Общая сумма вывода (TON)": [round(summary["total_value"], 4)],
+            "Количество транзакций": [summary["tx_count"]],
+            "Последняя транзакция": [last_tx_str],
+        })
+
+    except Exception as e:
+        st.error(f"Ошибка при получении данных: {e}")
@@ -1,38 +1,48 @@
 import calendar
-import plotly.express as px
-import plotly.colors as pc
+import time
 import pandas as pd
-import plotly.express as px
 import streamlit as st
-from datetime import datetime, timedelta, timezone
+
+from functools import partial
+from typing import Any, Callable, Hashable, Optional, Sequence, Tuple
+
+from analytics.cache import ResultCache
+from analytics.metrics import dense_series
+from analytics.storage import get_data_version
+from config import CARDS_MAX_AGE, CARDS_REFRESH_SECONDS, CHART_MAX_POINTS, FIGURE_CACHE_ENTRIES, LAZY_TABS
+from ui.downsample import downsample_line, rebucket_bars, rebucket_step
+
+# готовые фигуры Plotly: общие для всех сессий, st.plotly_chart их не меняет.
+# Хранится сам объект — словарь/JSON st.plotly_chart заново валидирует (~10x дольше).
+# Лимит — только по числу: размер Figure getsizeof не видит
+figure_cache = ResultCache(max_entries=FIGURE_CACHE_ENTRIES, max_bytes=None, stale_while_revalidate=False)
+
+
+# стили карточек — общие для Streamlit и статического экспорта (ui.static_export)
+CARD_STYLES = """
+    .card {
+        background-color: #1e1e1e;
+        border-radius: 12px;
+        padding: 18px;
+        box-shadow: 0 0 12px rgba(255,255,255,0.05);
+        text-align: center;
+        color: white;
+        margin: 6px 0;
+    }
+    .card-label {
+        font-size: 13px;
+        color: #bbbbbb;
+    }
+    .card-value {
+        font-size: 26px;
+        font-weight: 600;
+        color: #fdfdfd;
+    }
+"""
 
 
 def inject_card_styles():
-    st.markdown(
-        """
-        <style>
-        .card {
-            background-color: #1e1e1e;
-            border-radius: 12px;
-            padding: 18px;
-            box-shadow: 0 0 12px rgba(255,255,255,0.05);
-            text-align: center;
-            color: white;
-            margin: 6px 0;
-        }
-        .card-label {
-            font-size: 13px;
-            color: #bbbbbb;
-        }
-        .card-value {
-            font-size: 26px;
-            font-weight: 600;
-            color: #fdfdfd;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(f"<style>{CARD_STYLES}</style>", unsafe_allow_html=True)
 
 
 def metric_card(label: str, value: str, tooltip: str = "") -> str:
@@ -44,57 +54,111 @@ def metric_card(label: str, value: str, tooltip: str = "") -> str:
     """
 
 
+def live_cards(
+    key: str,
+    load: Callable[[], Any],
+    render: Callable[[Any], None],
+    initial: Optional[Tuple[int, Any]] = None,
+    run_every: Optional[float] = CARDS_REFRESH_SECONDS,
+    max_age: float = CARDS_MAX_AGE,
+):
+    """Группа карточек во фрагменте, который сам перезапускается раз в run_every сек.
+
+    На тике читается только версия данных; load() вызывается, лишь когда она
+    изменилась (или данным больше max_age — окна day/week/month сдвигаются),
+    иначе карточки перерисовываются из session_state. initial — (версия,
+    данные), уже полученные страницей в этом прогоне.
+    """
+    state_key = f"cards_{key}"
+    if initial is not None:
+        st.session_state[state_key] = (*initial, time.time())
+
+    @st.fragment(run_every=run_every)
+    def _cards():
+        version = get_data_version()
+        state = st.session_state.get(state_key)
+        if state is None or state[0] != version or time.time() - state[2] > max_age:
+            state = st.session_state[state_key] = (version, load(), time.time())
+        render(state[1])
+
+    _cards()
+
+
 def fill_missing_dates(df: pd.DataFrame, period: str) -> pd.DataFrame:
-    PERIODS_IN_SECONDS = {
-        "daily": 86400,
-        "weekly": 86400 * 7,
-        "monthly": 86400 * 30,
-        "all": None,
-    }
+    # ряды из analytics.metrics уже плотные; для прочих — тот же генератор бакетов
+    return dense_series(df, period)
 
-    now = datetime.now(timezone.utc)
-    df["period"] = pd.to_datetime(df["period"], utc=True)
 
-    seconds = PERIODS_IN_SECONDS.get(period)
+def draw_chart(
+    df,
+    title,
+    base_color="#3a6da3",
+    x_dtick=None,
+    x_format=None,
+    rotate_threshold=32,
+    kind="bar",
+    max_points=CHART_MAX_POINTS,
+    cache_key=None,
+    rebucket=None,
+):
+    """cache_key — идентичность ряда и период, например (spec, "daily").
 
-    if period == "daily":
-        full_range = pd.date_range(
-            end=now.replace(minute=0, second=0, microsecond=0),
-            periods=24,
-            freq="h",
-        )
-        df["period"] = df["period"].dt.floor("h")
-    elif period in {"weekly", "monthly"}:
-        days = 7 if period == "weekly" else 30
-        start = (now - timedelta(days=days)).replace(
-            hour=0, minute=0, second=0, microsecond=0
+    С ним готовая фигура берётся из figure_cache (ключ + параметры графика +
+    версия данных), и Plotly не строится вовсе; df тогда может быть функцией
+    без аргументов — ряд запрашивается только при промахе.
+
+    rebucket(freq) — ряд, заново посчитанный на крупном шаге; обязателен для
+    неаддитивных рядов (уникальные кошельки), иначе столбцы суммируются.
+    """
+    fig = chart_figure(df, title, base_color, x_format, rotate_threshold, kind, max_points, cache_key, rebucket)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def chart_figure(
+    df,
+    title,
+    base_color="#3a6da3",
+    x_format=None,
+    rotate_threshold=32,
+    kind="bar",
+    max_points=CHART_MAX_POINTS,
+    cache_key=None,
+    rebucket=None,
+):
+    """Фигура Plotly для draw_chart и статического экспорта (через figure_cache)."""
+    fig = None
+    if cache_key is not None:
+        key = (cache_key, title, base_color, x_format, rotate_threshold, kind, max_points)
+        version = get_data_version()
+        fig = figure_cache.get(key, version)
+    if fig is None:
+        fig = _build_figure(
+            df() if callable(df) else df, title, base_color, x_format, rotate_threshold, kind, max_points, rebucket
         )
-        end = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        full_range = pd.date_range(start=start, end=end, freq="D")
-        df["period"] = df["period"].dt.floor("d")
-    elif period == "all":
-        start = df["period"].min().floor("D")
-        end = pd.Timestamp(now).floor("D")  # 👈 исправлено
-        full_range = pd.date_range(start=start, end=end, freq="D")
-        df["period"] = df["period"].dt.floor("D")
-        df["period"] = df["period"].dt.floor("d")
-    else:
-        raise ValueError(f"Invalid period: {period}")
+        if cache_key is not None:
+            figure_cache.put(key, version, fig)
+    return fig
 
-    numeric_cols = df.select_dtypes(include="number").columns.tolist()
-    df = df.groupby("period")[numeric_cols].sum().reset_index()
 
-    df = (
-        df.set_index("period")
-        .reindex(full_range, fill_value=0)
-        .rename_axis("period")
-        .reset_index()
-    )
+def _build_figure(df, title, base_color, x_format, rotate_threshold, kind, max_points, rebucket=None):
+    # plotly.express импортируется ~0.2 с: откладываем до первого промаха figure_cache
+    import plotly.colors as pc
+    import plotly.express as px
 
-    return df
+    df = df.copy()
+    df["period"] = pd.to_datetime(df["period"])
 
+    # ─────── Прореживание: столбцы — укрупнение шага, линии — LTTB
+    if kind == "line":
+        df = downsample_line(df, "tx_count", max_points)
+    else:
+        freq, step = rebucket_step(df, max_points)
+        if freq:
+            df = rebucket(freq) if rebucket is not None else rebucket_bars(df, freq)
+            df["period"] = pd.to_datetime(df["period"])
+            # шаг — всегда в заголовке, какой бы ни была исходная подпись
+            title = f"{title.removesuffix(' (Daily)')} ({step})"
 
-def draw_chart(df, title, base_color="#3a6da3", x_dtick=None, x_format=None, rotate_threshold=32):
     max_tx = df["tx_count"].max()
 
     # ─────── Y шаг
@@ -111,12 +175,9 @@ def draw_chart(df, title, base_color="#3a6da3", x_dtick=None, x_format=None, rot
     else:
         y_dtick = 100
 
-    df = df.copy()
-    df["period"] = pd.to_datetime(df["period"])
-
     # ─────── Определение группы по месяцу
     if title.lower().startswith("🕰️"):  # All Time
-        df["color_group"] = df["period"].dt.to_period("M").astype(str)
+        df["color_group"] = df["period"].dt.strftime("%Y-%m")
     else:
         df["color_group"] = ""
 
@@ -128,20 +189,72 @@ def draw_chart(df, title, base_color="#3a6da3", x_dtick=None, x_format=None, rot
     tick_angle = 90 if num_dates > rotate_threshold else 0
 
     # ─────── Генерация палитры (если есть цветовая группировка)
-    if df["color_group"].nunique() > 1:
-        palette = pc.sample_colorscale("Blues", df["color_group"].nunique())
-        color_map = dict(zip(sorted(df["color_group"].unique()), palette))
-        colors = df["color_group"].map(color_map)
-    else:
-        colors = base_color
+    groups = sorted(df["color_group"].unique())
+    color_map = None
+    if len(groups) > 1:
+        color_map = dict(zip(groups, pc.sample_colorscale("Blues", len(groups))))
 
-    fig = px.bar(df, x="period", y="tx_count", title=title, color=df["color_group"] if df["color_group"].nunique() > 1 else None, color_discrete_map=color_map if df["color_group"].nunique() > 1 else None)
-    fig.update_traces(marker_line_width=0, hovertemplate="%{x}<br>%{y} tx")
+    if kind == "line":
+        fig = px.line(df, x="period", y="tx_count", title=title, color_discrete_sequence=[base_color])
+        fig.update_traces(hovertemplate="%{x}<br>%{y} tx")
+    else:
+        # один trace с цветом на столбец, а не trace на каждый месяц
+        fig = px.bar(df, x="period", y="tx_count", title=title)
+        fig.update_traces(marker_line_width=0, hovertemplate="%{x}<br>%{y} tx")
+        if color_map:
+            fig.update_traces(marker_color=df["color_group"].map(color_map).tolist())
     fig.update_layout(showlegend=False, xaxis_title="", yaxis_title="")
     fig.update_xaxes(tickvals=tickvals, tickformat=x_format or "%Y-%m-%d", tickangle=tick_angle)
     fig.update_yaxes(dtick=y_dtick, tickformat=".0f")
+    return fig
+
+def tabs_with_series(
+    load: Callable[[str], pd.DataFrame],
+    charts: Sequence[Tuple[str, str, str, str]],
+    base_color: str = "#3a6da3",
+    lazy: bool = LAZY_TABS,
+    prefetch: Optional[Callable[[str], None]] = None,
+    key: Optional[str] = None,
+    cache_key: Optional[Hashable] = None,
+):
+    """Вкладки периодов: charts — [(подпись, period, заголовок, x_format)], load(period) -> df.
+
+    lazy=False — обычные st.tabs (Streamlit выполняет все вкладки сразу).
+    lazy=True — переключатель во фрагменте: запрашивается и рисуется только
+    выбранный период, переключение не перезапускает страницу; prefetch(period)
+    прогревает остальные в фоне. key — ключ переключателя в session_state
+    (см. selected_period); cache_key — идентичность ряда для figure_cache.
+    """
+    if not lazy:
+        for tab, (_, period, title, x_format) in zip(st.tabs([c[0] for c in charts]), charts):
+            with tab:
+                draw_chart(
+                    partial(load, period), title, base_color, x_format=x_format,
+                    cache_key=(cache_key, period) if cache_key is not None else None,
+                )
+        return
+
+    by_label = {c[0]: c for c in charts}
+
+    @st.fragment
+    def _selected_period():
+        label = st.segmented_control(
+            "Period", list(by_label), default=charts[0][0], label_visibility="collapsed", key=key
+        ) or charts[0][0]
+        _, period, title, x_format = by_label[label]
+        draw_chart(
+            partial(load, period), title, base_color, x_format=x_format,
+            cache_key=(cache_key, period) if cache_key is not None else None,
+        )
+        if prefetch is not None:
+            for _, other, _, _ in charts:
+                if other != period:
+                    prefetch(other)
+
+    _selected_period()
 
-    st.plotly_chart(fig, use_container_width=True)
 
-def tabs_with_series(*args, **kwargs):
-    pass  # или заглушка для тестов
+def selected_period(charts: Sequence[Tuple[str, str, str, str]], key: str) -> str:
+    """Период, который сейчас выбран в ленивых вкладках tabs_with_series(key=key)."""
+    label = st.session_state.get(key) or charts[0][0]
+    return next((period for tab, period, _, _ in charts if tab == label), charts[0][1])
@@ -0,0 +1,63 @@
+# ui/downsample.py
+# Прореживание рядов перед отправкой в Plotly: размер графика ограничен
+# бюджетом точек и не растёт вместе с историей.
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# от мелкого к крупному: берётся первый шаг, укладывающийся в бюджет
+REBUCKET_FREQS = [("W-MON", "Weekly"), ("MS", "Monthly"), ("QS", "Quarterly"), ("YS", "Yearly")]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Индексы точек по Largest-Triangle-Three-Buckets (первая и последняя сохраняются)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    edges = np.linspace(1, n - 1, n_out - 1).astype("int64")
+    picked = np.empty(n_out, dtype="int64")
+    picked[0], picked[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # вершина C — среднее следующего бакета (для последнего — последняя точка)
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nxt_lo:nxt_hi].mean(), y[nxt_lo:nxt_hi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        picked[i + 1] = a
+    return picked
+
+
+def downsample_line(df: pd.DataFrame, y: str, max_points: int) -> pd.DataFrame:
+    if len(df) <= max_points:
+        return df
+    x = pd.DatetimeIndex(df["period"]).as_unit("s").asi8
+    return df.iloc[lttb(x, df[y].to_numpy(), max_points)]
+
+
+def rebucket_step(df: pd.DataFrame, max_points: int) -> Tuple[Optional[str], str]:
+    """Первый шаг из REBUCKET_FREQS, при котором столбцы укладываются в бюджет.
+
+    Возвращает (частота, подпись) — (None, "") если ряд уже в бюджете.
+    """
+    if len(df) <= max_points:
+        return None, ""
+    for freq, label in REBUCKET_FREQS:
+        if len(df.resample(freq, on="period").size()) <= max_points:
+            break
+    return freq, label
+
+
+def rebucket_bars(df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """Суммы по шагу freq — только для аддитивных рядов (транзакции, новые пользователи)."""
+    return (
+        df.resample(freq, on="period", label="left", closed="left")
+        .sum(numeric_only=True)
+        .reset_index()
+    )
@@ -0,0 +1,239 @@
+# ui/page_specs.py
+# Описания страниц контрактов: новая страница — запись здесь и файл в pages/
+# с вызовом render_contract_page("<ключ>"), без своего кода запросов.
+#
+# cards:   [(заголовок группы, [(подпись, ключ метрики, формат, подсказка), ...])]
+#          формат: "count" — 1,234; "usd" — $1,234.56
+# charts:  [(вкладка, period, заголовок графика, x_format)]
+# wallet_lookup: None или параметры поиска по кошельку
+
+PERIOD_TABS = [("📅 Daily", "daily"), ("📅 Weekly", "weekly"), ("📅 Monthly", "monthly"), ("📅 All Time", "all")]
+
+_USER_ACTIVITY = (
+    "### 🔥 User Activity",
+    [
+        ("DAU", "dau", "count", "Daily Active Users — unique addresses for the last 24 hours"),
+        ("WAU", "wau", "count", "Weekly Active Users — unique addresses for the last 7 days"),
+        ("MAU", "mau", "count", "Monthly Active Users — unique addresses for the last 30 days"),
+        ("UAW (All time)", "unique_wallets", "count", "Unique Active Wallets — total unique addresses"),
+    ],
+)
+
+_MINT_CARDS = [
+    (
+        "### 🧪 Mint Volume",
+        [
+            ("Mint / Day", "tx_day", "count", "The number of gems minted in the last 24 hours"),
+            ("Mint / Week", "tx_week", "count", "The number of gems minted in the last 7 days"),
+            ("Mint / Month", "tx_month", "count", "The number of gems minted in the last 30 days"),
+            ("Mint / Total", "total_tx_count", "count", "Total gems minted"),
+        ],
+    ),
+    _USER_ACTIVITY,
+]
+
+_REWARD_CARDS = [
+    (
+        "### 💸 Rewards Withdrawn (USDC)",
+        [
+            ("Withdraw / Day", "volume_day", "usd", "Withdrawn in the last 24 hours"),
+            ("Withdraw / Week", "volume_week", "usd", "Withdrawn in the last 7 days"),
+            ("Withdraw / Month", "volume_month", "usd", "Withdrawn in the last 30 days"),
+            ("Total Withdraw", "total_volume", "usd", "Total rewards withdrawn (USDC)"),
+        ],
+    ),
+    (
+        "### 👥 Unique Recipients",
+        [("Unique Wallets", "unique_wallets", "count", "Total number of unique addresses that received rewards")],
+    ),
+]
+
+
+def _charts(day: str, week: str, month: str, all_time: str, all_format: str = "%b %d") -> list:
+    titles = [(day, "%H:%M"), (week, "%b %d"), (month, "%b %d"), (all_time, all_format)]
+    return [(tab, period, title, fmt) for (tab, period), (title, fmt) in zip(PERIOD_TABS, titles)]
+
+
+_MINT_CHARTS = dict(
+    day="🕒 Mint in Last 24 Hours",
+    week="📅 Mint in Last 7 Days",
+    month="📅 Mint in Last 30 Days",
+    all_time="🕰️ Mint — All Time (Daily)",
+)
+
+_REWARD_CHARTS = _charts(
+    "💸 Withdrawals in Last 24 Hours",
+    "💸 Withdrawals in Last 7 Days",
+    "💸 Withdrawals in Last 30 Days",
+    "💸 Withdrawals — All Time (Daily)",
+)
+
+_REWARD_LOOKUP = {
+    "title": "### 🔍 Wallet Lookup: Total Rewards Withdrawn",
+    "placeholder": "Например: 0:abc...",
+    "contracts": [
+        "0x1f735280c83f13c6d40aa2ef213eb507cb4c1ec7",
+        "EQCfcwvBP2cnD8UwWLKtX1pcAqEDFwFyXzuZ0seyPBdocPHu",
+    ],
+    "types": [
+        "reward",
+        "0x76ebc41e",
+    ],
+}
+
+PAGE_SPECS = {
+    "base_mint_gem": {
+        "title": "Mint GEM — BASE",
+        "network": "BASE",
+        "contract": "0xa69a396c45bd525f8516a43242580c4e88bba401",
+        "type": "mintGem",
+        "color": "#3a6da3",
+        "cards": _MINT_CARDS,
+        "charts": _charts(**_MINT_CHARTS),
+        "wallet_lookup": None,
+    },
+    "base_rewards": {
+        "title": "Rewards Withdrawal — BASE",
+        "network": "BASE",
+        "contract": "0x1f735280c83f13c6d40aa2ef213eb507cb4c1ec7",
+        "type": "reward",
+        "color": "#3a6da3",
+        "cards": _REWARD_CARDS,
+        "charts": _REWARD_CHARTS,
+        "wallet_lookup": _REWARD_LOOKUP,
+    },
+    "base_deposit": {
+        "title": "Deposits — BASE",
+        "network": "BASE",
+        "contract": "0x252683e292d7e36977de92a6bf779d6bc35176d4",
+        "type": "resetAndSendSponsorship",
+        "color": "#3a6da3",
+        "cards": [
+            (
+                "### ➕ Deposits",
+                [
+                    ("💰 Total Deposit Volume (USDC)", "total_volume", "usd", "Общая сумма депозитов, выраженная в USDC"),
+                    ("➕ Number of Deposits", "total_tx_count", "count", "Общее количество транзакций-депозитов"),
+                ],
+            ),
+        ],
+        "charts": _charts(
+            "➕ Deposits in Last 24 Hours",
+            "➕ Deposits in Last 7 Days",
+            "➕ Deposits in Last 30 Days",
+            "➕ Deposits — All Time (Daily)",
+        ),
+        "wallet_lookup": None,
+    },
+    "ton_mint_gem": {
+        "title": "Mint GEM — TON",
+        "network": "TON",
+        "contract": "UQCn9hCC6tNykDqZisfJvwrE9RQNPalV8VArNWrmI_REtoHz",
+        "type": "TextComment",
+        "color": "#3a6da3",
+        "cards": _MINT_CARDS,
+        "charts": _charts(**_MINT_CHARTS, all_format="%b %d %Y"),
+        "wallet_lookup": None,
+    },
+    "ton_rewards": {
+        "title": "Rewards Withdrawal — TON",
+        "network": "TON",
+        "contract": "EQCfcwvBP2cnD8UwWLKtX1pcAqEDFwFyXzuZ0seyPBdocPHu",
+        "type": "0x76ebc41e",
+        "color": "#3a6da3",
+        "cards": _REWARD_CARDS,
+        "charts": _REWARD_CHARTS,
+        "wallet_lookup": _REWARD_LOOKUP,
+    },
+}
+
+# страница 6: награды обеих сетей вместе (карточки — по объединённым метрикам)
+ALL_CHAINS_REWARDS = {
+    "title": "Total Rewards Withdrawn — All Chains",
+    "networks": {
+        "BASE": {
+            "contract": "0x1f735280c83f13c6d40aa2ef213eb507cb4c1ec7",
+            "type": "reward",
+            "symbol": "USDC",
+        },
+        "TON": {
+            "contract": "EQCfcwvBP2cnD8UwWLKtX1pcAqEDFwFyXzuZ0seyPBdocPHu",
+            "type": "0x76ebc41e",
+            "symbol": "USDT",
+        },
+    },
+    "color": "#3a6da3",
+    "cards": [
+        (
+            "### 💰 Total Rewards Withdrawn (All Chains)",
+            [
+                ("Withdraw / Day", "tx_day", "count", "Total withdrawn in last 24h"),
+                ("Withdraw / Week", "tx_week", "count", "Total withdrawn in last 7d"),
+                ("Withdraw / Month", "tx_month", "count", "Total withdrawn in last 30d"),
+                ("Total Withdrawn", "total_tx_count", "count", "All-time rewards withdrawn"),
+            ],
+        ),
+        (
+            "### 👥 & 💰 Summary",
+            [
+                ("Unique Wallets", "unique_wallets", "count", "Total unique reward recipients across chains"),
+                ("Total Withdrawn Volume", "total_volume", "usd", "Sum of all rewards withdrawn (USDC + USDT)"),
+            ],
+        ),
+    ],
+    "charts": _charts(
+        "💸 Total Withdrawals by Day",
+        "📅 Total Withdrawals by Week",
+        "📅 Total Withdrawals by Month",
+        "📅 Total Withdrawals — All Time",
+    ),
+    "wallet_lookup": {**_REWARD_LOOKUP, "placeholder": "0xabc..."},
+}
+
+# страница 7: все типы во всех сетях; графики — уникальные пользователи
+TOTAL_DASHBOARD = {
+    "title": "TOTAL DASHBOARD",
+    "types": ["reward", "0x76ebc41e", "TextComment", "resetAndSendSponsorship", "mintGem"],
+    "color": "#47A76A",
+    # ключи — из total_dashboard_values(): суммы по типам + объединённые метрики
+    "cards": [
+        (
+            "### 📊 Total Metrics",
+            [
+                ("TOTAL GEM MINTS", "total_gem_mints", "count", "All gem mints (TON + BASE)"),
+                ("TOTAL REWARDS", "total_rewards", "usd", "Total rewards distributed"),
+                ("TOTAL DEPOSITS", "total_deposits", "usd", "Deposits (BASE only)"),
+            ],
+        ),
+        (
+            "### 👥 Unique Users — All Chains",
+            [
+                ("DAU", "dau", "count", "Users in the last 24h"),
+                ("WAU", "wau", "count", "Users in the last 7d"),
+                ("MAU", "mau", "count", "Users in the last 30d"),
+                ("All Time", "unique_wallets", "count", "Total unique users who interacted with contracts"),
+            ],
+        ),
+    ],
+    "totals": {
+        "total_gem_mints": ("total_tx_count", ["mintGem", "TextComment"]),
+        "total_rewards": ("total_volume", ["reward", "0x76ebc41e"]),
+        "total_deposits": ("total_volume", ["resetAndSendSponsorship"]),
+    },
+    "charts": _charts(
+        "📅 Daily Active Users — All Chains",
+        "📅 Weekly Active Users — All Chains",
+        "📅 Monthly Active Users — All Chains",
+        "📅 All Time Unique Users",
+    ),
+    "first_time_chart": ("🧍 First-Time", "all", "🧍 First-Time Unique Users", "%b %d"),
+}
+
+
+def total_dashboard_values(m: dict) -> dict:
+    """Значения карточек TOTAL_DASHBOARD из {тип: метрики, "all": объединённые}."""
+    totals = {
+        name: sum(m[type_][key] for type_ in types)
+        for name, (key, types) in TOTAL_DASHBOARD["totals"].items()
+    }
+    return m["all"] | totals
@@ -0,0 +1,257 @@
+# ui/static_export.py
+# Статический снимок дашборда: метрики и графики всех страниц в HTML/JSON.
+# Публичный трафик отдаёт любой статический сервер из STATIC_EXPORT_DIR —
+# Streamlit остаётся для внутренних пользователей. Вызывается планировщиком
+# после каждого цикла загрузки; вручную — python -m ui.static_export [каталог].
+import html
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import plotly.io as pio
+
+from analytics import serialize
+from analytics.metrics import (
+    get_calendar_series,
+    get_metrics_many,
+    get_new_users_series,
+    get_page_data,
+    get_time_series_many,
+)
+from analytics.storage import get_data_version, init_db
+from config import STATIC_EXPORT_DIR, STATIC_EXPORT_MAX_AGE
+from ui.contract_page import CARD_FORMATS
+from ui.display import CARD_STYLES, chart_figure, metric_card
+from ui.page_specs import ALL_CHAINS_REWARDS, PAGE_SPECS, PERIOD_TABS, TOTAL_DASHBOARD, total_dashboard_values
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+    body {{ background: #0e1117; color: #fafafa; font-family: sans-serif; margin: 0 auto; max-width: 1200px; padding: 24px; }}
+    a {{ color: #8ab4f8; }}
+    .row {{ display: flex; gap: 16px; }}
+    .row > .card {{ flex: 1; }}
+    .generated {{ color: #888888; font-size: 12px; }}
+{card_styles}
+</style>
+</head>
+<body>
+<p><a href="index.html">← All pages</a></p>
+<h1>{title}</h1>
+{body}
+<p class="generated">Generated {generated_at} UTC · data version {version} · <a href="{name}.json">JSON</a></p>
+</body>
+</html>
+"""
+
+_lock = threading.Lock()
+_last_export = (None, 0.0)  # (версия данных, время)
+
+
+def _write(path: str, text: str):
+    # атомарно: статический сервер никогда не отдаёт недописанный файл
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def _cards_html(groups: list, values: dict) -> str:
+    parts = []
+    for heading, cards in groups:
+        parts.append(f"<h3>{html.escape(heading.lstrip('# '))}</h3>")
+        row = "".join(
+            metric_card(html.escape(label), CARD_FORMATS[fmt].format(values[key]), html.escape(tooltip))
+            for label, key, fmt, tooltip in cards
+        )
+        parts.append(f'<div class="row">{row}</div>')
+    return "\n".join(parts)
+
+
+def _charts_html(charts: list, series: dict, color: str, cache_key, include_js: bool = True, rebucket=None) -> str:
+    parts = []
+    for i, (_, period, title, x_format) in enumerate(charts):
+        # те же ключи figure_cache, что и на страницах: фигура строится один раз
+        fig = chart_figure(
+            series[period], title, color, x_format=x_format, cache_key=(cache_key, period), rebucket=rebucket
+        )
+        first = include_js and i == 0
+        parts.append(pio.to_html(fig, full_html=False, include_plotlyjs="cdn" if first else False))
+    return "\n".join(parts)
+
+
+def _page(name: str, title: str, cards_html: str, charts_html: str, data: dict, meta: dict) -> dict:
+    return {
+        "name": name,
+        "title": title,
+        "html": PAGE_TEMPLATE.format(
+            title=html.escape(title),
+            card_styles=CARD_STYLES,
+            body=f"{cards_html}\n<hr>\n{charts_html}",
+            generated_at=meta["generated_at"],
+            version=meta["data_version"],
+            name=name,
+        ),
+        "json": {"title": title, **meta, **data},
+    }
+
+
+def _contract_pages(meta: dict) -> list:
+    periods = [period for _, period in PERIOD_TABS]
+    specs = {name: (s["network"], s["contract"], s["type"]) for name, s in PAGE_SPECS.items()}
+    # все страницы контрактов — одним обращением к аналитике
+    data = get_page_data(list(specs.values()), periods)
+
+    pages = []
+    for name, spec in PAGE_SPECS.items():
+        series_spec = specs[name]
+        metrics = data["metrics"][series_spec]
+        series = {period: data["series"][period][series_spec] for period in periods}
+        charts_html = _charts_html(spec["charts"], series, spec["color"], series_spec)
+        pages.append(_page(
+            name,
+            spec["title"],
+            f"<p>CONTRACT: <code>{html.escape(spec['contract'])}</code></p>\n" + _cards_html(spec["cards"], metrics),
+            charts_html,
+            {
+                "network": spec["network"],
+                "contract": spec["contract"],
+                "type": spec["type"],
+                "metrics": metrics,
+                "series": {period: serialize.records(df) for period, df in series.items()},
+            },
+            meta,
+        ))
+    return pages
+
+
+def _all_chains_page(meta: dict) -> dict:
+    spec = ALL_CHAINS_REWARDS
+    specs = [(net, data["contract"], data["type"]) for net, data in spec["networks"].items()]
+    metrics = get_metrics_many(specs)
+    all_series = get_time_series_many(specs)
+    series = {period: all_series[period]["combined"] for _, period, _, _ in spec["charts"]}
+    return _page(
+        "all_chains_rewards",
+        spec["title"],
+        _cards_html(spec["cards"], metrics["combined"]),
+        _charts_html(spec["charts"], series, spec["color"], "withdrawals_all_chains"),
+        {
+            "networks": spec["networks"],
+            "metrics": metrics["combined"],
+            "metrics_by_network": {s[0]: metrics["series"][s] for s in specs},
+            "series": {period: serialize.records(df) for period, df in series.items()},
+        },
+        meta,
+    )
+
+
+def _total_dashboard_page(meta: dict) -> dict:
+    spec = TOTAL_DASHBOARD
+    specs = [(None, None, t) for t in spec["types"]]
+    m = get_metrics_many(specs)
+    by_type = {s[2]: values for s, values in m["series"].items()} | {"all": m["combined"]}
+    all_series = get_time_series_many(specs)
+
+    # уникальные пользователи в бакете — по объединению всех типов
+    series = {}
+    for _, period, _, _ in spec["charts"]:
+        users = all_series[period]["combined"][["period", "unique_wallets"]]
+        series[period] = users.rename(columns={"unique_wallets": "tx_count"})
+
+    def users_rebucketed(freq: str):
+        # крупный шаг — пересчёт distinct в SQL, а не сумма дневных значений
+        users = get_calendar_series(specs, freq)["combined"][["period", "unique_wallets"]]
+        return users.rename(columns={"unique_wallets": "tx_count"})
+
+    _, first_period, _, _ = spec["first_time_chart"]
+    first_time = get_new_users_series(spec["types"], period=first_period).rename(columns={"new_users": "tx_count"})
+
+    charts_html = "\n".join([
+        _charts_html(spec["charts"], series, spec["color"], "users_all_chains", rebucket=users_rebucketed),
+        _charts_html([spec["first_time_chart"]], {first_period: first_time}, spec["color"], "first_time_users", False),
+    ])
+    return _page(
+        "total_dashboard",
+        spec["title"],
+        _cards_html(spec["cards"], total_dashboard_values(by_type)),
+        charts_html,
+        {
+            "types": spec["types"],
+            "metrics": by_type,
+            "series": {period: serialize.records(df) for period, df in series.items()},
+            "first_time_users": serialize.records(first_time),
+        },
+        meta,
+    )
+
+
+def _index_html(pages: list, meta: dict) -> str:
+    links = "\n".join(
+        f'<li><a href="{p["name"]}.html">{html.escape(p["title"])}</a> · <a href="{p["name"]}.json">JSON</a></li>'
+        for p in pages
+    )
+    return PAGE_TEMPLATE.format(
+        title="Dashboard",
+        card_styles="",
+        body=f"<ul>\n{links}\n</ul>",
+        generated_at=meta["generated_at"],
+        version=meta["data_version"],
+        name="index",
+    )
+
+
+def export_snapshot(out_dir: str = STATIC_EXPORT_DIR) -> list:
+    """Пишет {страница}.html / .json, index.html и index.json; возвращает имена страниц."""
+    global _last_export
+    version = get_data_version()
+    meta = {
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+        "data_version": version,
+    }
+    pages = [*_contract_pages(meta), _all_chains_page(meta), _total_dashboard_page(meta)]
+
+    os.makedirs(out_dir, exist_ok=True)
+    for page in pages:
+        _write(os.path.join(out_dir, f"{page['name']}.html"), page["html"])
+        _write(
+            os.path.join(out_dir, f"{page['name']}.json"),
+            serialize.dumps(page["json"]),
+        )
+    index = {**meta, "pages": [{"name": p["name"], "title": p["title"]} for p in pages]}
+    _write(os.path.join(out_dir, "index.json"), serialize.dumps(index))
+    _write(os.path.join(out_dir, "index.html"), _index_html(pages, meta))
+
+    _last_export = (version, time.time())
+    return [p["name"] for p in pages]
+
+
+def maybe_export_snapshot(out_dir: str = STATIC_EXPORT_DIR) -> Optional[list]:
+    """Экспорт, если версия данных изменилась или снимку больше STATIC_EXPORT_MAX_AGE.
+
+    Циклы BASE и TON могут закончиться одновременно — второй не ждёт, а
+    пропускает экспорт, пока идёт первый.
+    """
+    if not _lock.acquire(blocking=False):
+        return None
+    try:
+        version, exported_at = _last_export
+        if version == get_data_version() and time.time() - exported_at < STATIC_EXPORT_MAX_AGE:
+            return None
+        return export_snapshot(out_dir)
+    finally:
+        _lock.release()
+
+
+if __name__ == "__main__":
+    out = sys.argv[1] if len(sys.argv) > 1 else STATIC_EXPORT_DIR
+    started = time.perf_counter()
+    init_db()
+    names = export_snapshot(out)
+    print(f"[export] {len(names)} pages → {out} in {time.perf_counter() - started:.2f}s")